@@ -1,4 +1,18 @@
 import heapq
+import importlib.util
+import os
+import sys
+
+# SearchStats jest wspólne z przeszukiwaniami z katalogu MINMAX - ładujemy MINMAX/search_stats.py
+# wprost z pliku (jak messy/CoolingSchedules.py), bez dopisywania katalogu MINMAX/ do sys.path
+_STATS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'MINMAX', 'search_stats.py')
+_search_stats = sys.modules.get('minmax_search_stats')
+if _search_stats is None:
+    _spec = importlib.util.spec_from_file_location('minmax_search_stats', _STATS_PATH)
+    _search_stats = importlib.util.module_from_spec(_spec)
+    sys.modules['minmax_search_stats'] = _search_stats
+    _spec.loader.exec_module(_search_stats)
+measure = _search_stats.measure
 
 class PuzzleState:
     def __init__(self, board, parent, move, depth, cost):
@@ -19,7 +33,13 @@ def manhattan_distance(board, goal):
         distance += abs(x1 - x2) + abs(y1 - y2)
     return distance
 
-def a_star_search(initial_state, goal_state):
+def a_star_search(initial_state, goal_state, stats=None):
+    # stats (search_stats.SearchStats) liczy rozwinięte stany według głębokości
+    # oraz największe rozmiary kolejki (open) i zbioru odwiedzonych (closed)
+    with measure(stats, None):
+        return _a_star_search(initial_state, goal_state, stats)
+
+def _a_star_search(initial_state, goal_state, stats):
     explored = set()
     priority_queue = []
     initial = PuzzleState(initial_state, None, None, 0, manhattan_distance(initial_state, goal_state))
@@ -28,6 +48,9 @@ def a_star_search(initial_state, goal_state):
     while priority_queue:
         current_state = heapq.heappop(priority_queue)
         explored.add(tuple(current_state.board))
+        if stats is not None:
+            stats.node(current_state.depth)
+            stats.frontier(len(priority_queue) + 1, len(explored))
 
         if current_state.board == goal_state:
             return current_state
@@ -71,18 +94,19 @@ def print_board(board):
         print(board[i:i+3])
     print()  # Dla odstępu między stanami
 
-# Example usage
-initial = [1, 3, 2, 4, 6, 5, 0, 7, 8]
-goal = [1, 2, 3, 4, 5, 6, 7, 8, 0]
-result = a_star_search(initial, goal)
+if __name__ == "__main__":
+    # Example usage
+    initial = [1, 3, 2, 4, 6, 5, 0, 7, 8]
+    goal = [1, 2, 3, 4, 5, 6, 7, 8, 0]
+    result = a_star_search(initial, goal)
 
-if result:
-    print("Puzzle solved!\n")
-    path = []
-    while result:
-        path.append(result)
-        result = result.parent
-    for state in reversed(path):
-        print_board(state.board)
-else:
-    print("No solution found.")
+    if result:
+        print("Puzzle solved!\n")
+        path = []
+        while result:
+            path.append(result)
+            result = result.parent
+        for state in reversed(path):
+            print_board(state.board)
+    else:
+        print("No solution found.")
@@ -0,0 +1,131 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from RuleBase import CompiledRules
+
+# Baza reguł w procesie roboczym
+_batch = None
+
+
+class BatchRules:
+    """Skompilowana baza reguł w postaci tablic NumPy do oceny wielu pacjentów naraz.
+
+    Pacjenci to wiersze macierzy logicznej (pacjenci x symbole). Przesłanki reguł z
+    niepustą listą przesłanek leżą kolejno w `premises`, a reguła k zajmuje fragment
+    od `starts[k]` - dzięki temu warunek reguły dla całej partii to jedno reduceat.
+    """
+
+    def __init__(self, compiled):
+        self.compiled = compiled
+        self.n_symbols = len(compiled.symbols)
+
+        lengths = np.array([len(p) for p in compiled.rule_premises], dtype=np.int64)
+        conclusions = np.array(compiled.rule_conclusion, dtype=np.int64)
+        nonempty = lengths > 0
+
+        self.premises = np.array([p for premises in compiled.rule_premises for p in premises], dtype=np.int64)
+        self.starts = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1])).astype(np.int64)
+        self.lengths = lengths[nonempty]
+        self.conclusions = conclusions[nonempty]
+        self.unconditional = np.unique(conclusions[~nonempty])
+
+    def facts_matrix(self, patients):
+        """Macierz logiczna (pacjenci x symbole); fakty spoza słownika są pomijane"""
+        matrix = np.zeros((len(patients), self.n_symbols), dtype=bool)
+        for row, facts in enumerate(patients):
+            ids = list(self.compiled.ids(facts))
+            matrix[row, ids] = True
+        return matrix
+
+    def satisfied(self, bits):
+        """Które reguły (z niepustymi przesłankami) mają spełnione wszystkie przesłanki.
+
+        bits to zbiory bitowe pacjentów dla każdego symbolu (symbole x słowa); wynik ma
+        ten sam układ dla reguł.
+        """
+        if not len(self.premises):
+            return np.zeros((0, bits.shape[1]), dtype=bits.dtype)
+        return np.bitwise_and.reduceat(bits[self.premises], self.starts, axis=0)
+
+    def closure(self, facts):
+        """Wnioskowanie w przód dla całej partii - powtarza odpalanie reguł aż nic nie przybędzie.
+
+        Pacjenci pakowani są po 64 w słowo, więc odpalenie reguły dla całej partii to
+        kilka operacji bitowych na słowach.
+        """
+        n = facts.shape[0]
+        words = -(-n // 64)
+        packed = np.zeros((self.n_symbols, words * 8), dtype=np.uint8)
+        packed[:, :-(-n // 8)] = np.packbits(facts.T, axis=1, bitorder='little')
+        bits = packed.view(np.uint64)
+        bits[self.unconditional] = ~np.uint64(0)
+
+        while True:
+            before = bits.copy()
+            np.bitwise_or.at(bits, self.conclusions, self.satisfied(bits))
+            if np.array_equal(bits, before):
+                break
+        return np.unpackbits(bits.view(np.uint8), axis=1, count=n, bitorder='little').T.astype(bool)
+
+    def scores(self, facts):
+        """Liczba spełnionych przesłanek każdej reguły (pacjenci x reguły z przesłankami)"""
+        if not len(self.premises):
+            return np.zeros((facts.shape[0], 0), dtype=np.int32)
+        return np.add.reduceat(facts[:, self.premises], self.starts, axis=1, dtype=np.int32)
+
+    def diagnose(self, patients):
+        """Dla każdego pacjenta (inferred, recommendations_found, best_match) -
+        to samo co forward_chaining i best_matching_disease z Main.py"""
+        compiled = self.compiled
+        facts = self.facts_matrix(patients)
+        derived = self.closure(facts) & ~facts
+
+        scores = self.scores(facts)
+        if scores.shape[1]:
+            best = scores.argmax(axis=1)
+            best_scores = scores[np.arange(len(patients)), best]
+        else:
+            best = best_scores = np.zeros(len(patients), dtype=np.int64)
+
+        results = []
+        for row, patient in enumerate(patients):
+            new = np.flatnonzero(derived[row])
+            recs = {compiled.recommendations[s] for s in new if s in compiled.recommendations}
+
+            best_match = None
+            if best_scores[row] > 0:
+                k = best[row]
+                best_match = (compiled.symbols[self.conclusions[k]], int(best_scores[row]), int(self.lengths[k]))
+            results.append((set(patient).union(compiled.symbols[s] for s in new), recs, best_match))
+        return results
+
+
+def _init_worker(rules, recommendations):
+    global _batch
+    _batch = BatchRules(CompiledRules(rules, recommendations))
+
+
+def _diagnose_chunk(patients):
+    return _batch.diagnose(patients)
+
+
+def diagnose_batch(rules, recommendations, patients, workers=1, chunk_size=1000):
+    """Ocena wielu pacjentów jedną skompilowaną bazą reguł.
+
+    Pacjenci dzieleni są na partie po chunk_size; przy workers > 1 (None - wszystkie
+    rdzenie) partie liczone są w osobnych procesach, a każdy proces kompiluje bazę raz.
+    Zwraca listę (inferred, recommendations_found, best_match) w kolejności pacjentów.
+    """
+    patients = [set(p) for p in patients]
+    chunks = [patients[i:i + chunk_size] for i in range(0, len(patients), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        batch = BatchRules(CompiledRules(rules, recommendations))
+        return [result for chunk in chunks for result in batch.diagnose(chunk)]
+
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(rules, recommendations)) as pool:
+        return [result for chunk_results in pool.map(_diagnose_chunk, chunks) for result in chunk_results]
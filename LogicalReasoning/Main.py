@@ -1,3 +1,5 @@
+from RuleBase import CompiledRules, top_k_diseases
+
 rules = [
     (["gorączka", "kaszel", "zmęczenie"], "grypa"),
     (["gorączka", "wysypka", "zaczerwienione oczy"], "odra"),
@@ -109,4 +111,11 @@ if __name__ == "__main__":
         if disease in recommendations:
             print(f"Zalecenie: {recommendations[disease]}")
     else:
-        print("Nie można wnioskowac zadnej choroby.")
\ No newline at end of file
+        print("Nie można wnioskowac zadnej choroby.")
+
+    print("\n=== Ranking chorob ===")
+    for disease, score, matched, total, recommendation in top_k_diseases(CompiledRules(rules, recommendations),
+                                                                         facts, k=3, score='ratio'):
+        print(f"- {disease}: {matched}/{total} objawow ({score:.0%})")
+        if recommendation is not None:
+            print(f"  Zalecenie: {recommendation}")
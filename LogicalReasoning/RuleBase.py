@@ -0,0 +1,280 @@
+import heapq
+from collections import deque
+
+SCORES = ('count', 'ratio', 'jaccard')
+
+
+class CompiledRules:
+    """Baza reguł skompilowana do indeksów.
+
+    Symbole (objawy, choroby) zamieniane są na kolejne liczby. Dla każdego symbolu
+    trzymana jest lista reguł, w których występuje jako przesłanka (premise_index),
+    oraz reguł, które go wnioskują (conclusion_index).
+    """
+
+    def __init__(self, rules, recommendations=None):
+        self.symbols = []
+        self.symbol_ids = {}
+        self.rule_premises = []
+        self.rule_conclusion = []
+        self.premise_index = []
+        self.conclusion_index = []
+        self.unconditional = []
+        self.recommendations = {}
+
+        for premises, conclusion in rules:
+            self.add_rule(premises, conclusion)
+        for conclusion, text in (recommendations or {}).items():
+            self.recommendations[self.intern(conclusion)] = text
+
+    @classmethod
+    def from_arrays(cls, symbols, rule_premises, rule_conclusion, premise_index, conclusion_index, unconditional,
+                    recommendations):
+        """Baza z gotowych tablic (np. wczytanych z pliku .rbc) - bez ponownego indeksowania.
+
+        Tablice mogą być widokami tylko do odczytu, wtedy add_rule nie jest dostępne.
+        """
+        compiled = cls.__new__(cls)
+        compiled.symbols = symbols
+        compiled.symbol_ids = {symbol: i for i, symbol in enumerate(symbols)}
+        compiled.rule_premises = rule_premises
+        compiled.rule_conclusion = rule_conclusion
+        compiled.premise_index = premise_index
+        compiled.conclusion_index = conclusion_index
+        compiled.unconditional = unconditional
+        compiled.recommendations = recommendations
+        return compiled
+
+    def intern(self, symbol):
+        """Numer symbolu (nowy symbol dostaje kolejny numer)"""
+        symbol_id = self.symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbol_ids[symbol] = symbol_id
+            self.symbols.append(symbol)
+            self.premise_index.append([])
+            self.conclusion_index.append([])
+        return symbol_id
+
+    def add_rule(self, premises, conclusion):
+        rule_id = len(self.rule_premises)
+        premise_ids = tuple(dict.fromkeys(self.intern(p) for p in premises))
+        conclusion_id = self.intern(conclusion)
+
+        self.rule_premises.append(premise_ids)
+        self.rule_conclusion.append(conclusion_id)
+        for p in premise_ids:
+            self.premise_index[p].append(rule_id)
+        self.conclusion_index[conclusion_id].append(rule_id)
+        if not premise_ids:
+            self.unconditional.append(rule_id)
+        return rule_id
+
+    def __len__(self):
+        return len(self.rule_premises)
+
+    def ids(self, facts):
+        """Numery znanych symboli spośród faktów (nieznane są pomijane)"""
+        return {self.symbol_ids[f] for f in facts if f in self.symbol_ids}
+
+
+class CsrLists:
+    """Lista list zapisana płasko: i-ta lista to values[offsets[i]:offsets[i + 1]]"""
+
+    def __init__(self, offsets, values):
+        self.offsets = offsets
+        self.values = values
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return self.values[self.offsets[i]:self.offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def forward_chaining_compiled(compiled, facts):
+    """Wnioskowanie w przód na skompilowanej bazie - ten sam wynik co forward_chaining.
+
+    Każda reguła ma licznik niespełnionych przesłanek; nowy fakt zmniejsza liczniki tylko
+    tych reguł, w których występuje, a reguła odpala, gdy licznik spadnie do zera.
+    """
+    inferred = set(facts)
+    recommendations_found = set()
+    inferred_ids = compiled.ids(facts)
+    missing = {}
+
+    agenda = deque(inferred_ids)
+    # Reguły bez przesłanek są spełnione od razu
+    agenda.extend(-1 - rule_id for rule_id in compiled.unconditional)
+
+    while agenda:
+        item = agenda.popleft()
+        if item < 0:
+            fired = (-1 - item,)
+        else:
+            fired = []
+            for rule_id in compiled.premise_index[item]:
+                left = missing.get(rule_id, len(compiled.rule_premises[rule_id])) - 1
+                missing[rule_id] = left
+                if left == 0:
+                    fired.append(rule_id)
+
+        for rule_id in fired:
+            conclusion = compiled.rule_conclusion[rule_id]
+            if conclusion in inferred_ids:
+                continue
+            inferred_ids.add(conclusion)
+            inferred.add(compiled.symbols[conclusion])
+            agenda.append(conclusion)
+            # Sprawdzamy czy nowy wniosek ma zalecenie
+            if conclusion in compiled.recommendations:
+                recommendations_found.add(compiled.recommendations[conclusion])
+
+    return inferred, recommendations_found
+
+
+class BackwardChainer:
+    """Wnioskowanie wstecz dla jednego zestawu faktów (np. jednego pacjenta).
+
+    Udowodnione i obalone cele są zapamiętywane, więc kolejne zapytania o te same
+    podcele nic nie kosztują. Dla udowodnionego celu pamiętana jest tylko reguła, która
+    go wywiodła - opis dowodu budowany jest dopiero w explain().
+    """
+
+    def __init__(self, compiled, facts):
+        self.compiled = compiled
+        self.facts = set(facts)
+        # cel -> numer reguły, która go wywiodła (None dla faktów)
+        self.proofs = dict.fromkeys(compiled.ids(facts))
+        self.failed = set()
+
+    def prove(self, goal):
+        if goal in self.facts:
+            return True
+        goal_id = self.compiled.symbol_ids.get(goal)
+        if goal_id is None:
+            return False
+        return self._prove(goal_id, {}, [])[0]
+
+    def _prove(self, goal_id, active, provisional):
+        """Zwraca (czy udowodniony, najpłytszy cel na stosie, od którego zależała porażka).
+
+        Cel, który jest już na stosie (cykl), traktujemy jako niespełniony. Porażka zależna
+        od celu wyżej na stosie jest tymczasowa i nie trafia do pamięci - zapamiętujemy ją
+        dopiero, gdy porażką skończy się cel, od którego cykl się zaczął.
+        """
+        if goal_id in self.proofs:
+            return True, len(active)
+        if goal_id in self.failed:
+            return False, len(active)
+        if goal_id in active:
+            return False, active[goal_id]
+
+        depth = active[goal_id] = len(active)
+        first_provisional = len(provisional)
+        lowest = depth
+        for rule_id in self.compiled.conclusion_index[goal_id]:
+            for p in self.compiled.rule_premises[rule_id]:
+                success, low = self._prove(p, active, provisional)
+                lowest = min(lowest, low)
+                if not success:
+                    break
+            else:
+                del active[goal_id]
+                del provisional[first_provisional:]
+                self.proofs[goal_id] = rule_id
+                return True, depth
+
+        del active[goal_id]
+        if lowest < depth:
+            provisional.append(goal_id)
+        else:
+            self.failed.add(goal_id)
+            self.failed.update(provisional[first_provisional:])
+            del provisional[first_provisional:]
+        return False, lowest
+
+    def explain(self, goal):
+        """Opis dowodu (albo porażki) w formacie backward_chaining; każdy podcel opisany raz"""
+        path = []
+        goal_id = self.compiled.symbol_ids.get(goal)
+        if goal in self.facts:
+            return path
+        if goal_id is None:
+            path.append(f"Nie znaleziono regul prowadzacych do '{goal}'")
+            return path
+        self.prove(goal)
+        self._explain(goal_id, path, set())
+        return path
+
+    def _explain(self, goal_id, path, seen):
+        if goal_id in seen:
+            return
+        seen.add(goal_id)
+        symbols = self.compiled.symbols
+
+        if goal_id in self.proofs:
+            rule_id = self.proofs[goal_id]
+            if rule_id is None:
+                return
+            for p in self.compiled.rule_premises[rule_id]:
+                self._explain(p, path, seen)
+            path.append(f"Wszystkie premisy spełnione - wnioskujemy '{symbols[goal_id]}'")
+            return
+
+        for rule_id in self.compiled.conclusion_index[goal_id]:
+            for p in self.compiled.rule_premises[rule_id]:
+                if not self.prove(symbols[p]):
+                    self._explain(p, path, seen)
+                    path.append(f"Premisa '{symbols[p]}' nie jest spelniona")
+                    break
+        path.append(f"Nie znaleziono regul prowadzacych do '{symbols[goal_id]}'")
+
+
+def top_k_diseases(compiled, facts, k=3, score='count'):
+    """Ranking k najlepiej dopasowanych chorób - uogólnienie best_matching_disease.
+
+    Przez indeks przesłanek oglądane są tylko reguły mające wspólny objaw z faktami.
+    score: 'count' (liczba pasujących objawów), 'ratio' (pasujące / wszystkie przesłanki
+    reguły) albo 'jaccard' (pasujące / suma zbiorów objawów reguły i faktów).
+    Każda choroba występuje raz, z najlepiej ocenioną regułą; przy równych wynikach
+    wygrywa więcej pasujących objawów, a potem reguła wcześniejsza w bazie.
+
+    Zwraca listę (choroba, wynik, pasujące, wszystkie przesłanki, zalecenie albo None).
+    """
+    if score not in SCORES:
+        raise ValueError(f"Unknown score '{score}', expected one of {', '.join(SCORES)}")
+
+    matched = {}
+    for fact_id in compiled.ids(facts):
+        for rule_id in compiled.premise_index[fact_id]:
+            matched[rule_id] = matched.get(rule_id, 0) + 1
+
+    n_facts = len(set(facts))
+    best = {}
+    for rule_id, count in matched.items():
+        total = len(compiled.rule_premises[rule_id])
+        if score == 'count':
+            value = count
+        elif score == 'ratio':
+            value = count / total
+        else:
+            value = count / (total + n_facts - count)
+        key = (value, count, -rule_id)
+        disease = compiled.rule_conclusion[rule_id]
+        if disease not in best or key > best[disease][0]:
+            best[disease] = (key, total)
+
+    ranking = heapq.nlargest(k, best.items(), key=lambda item: item[1][0])
+    return [(compiled.symbols[disease], key[0], key[1], total, compiled.recommendations.get(disease))
+            for disease, (key, total) in ranking]
+
+
+def backward_chaining_compiled(compiled, goal, facts):
+    """Odpowiednik backward_chaining - zwraca (czy cel jest spełniony, opis dowodu)"""
+    chainer = BackwardChainer(compiled, facts)
+    return chainer.prove(goal), chainer.explain(goal)
@@ -0,0 +1,302 @@
+import argparse
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from RuleBase import CompiledRules, CsrLists, forward_chaining_compiled
+
+COMPILED_SUFFIX = '.rbc'
+COMPILED_MAGIC = b'RBC1'
+COMPILED_VERSION = 1
+# magic, wersja, kolejność bajtów, rozmiar i czas modyfikacji źródła, liczba sekcji
+_HEADER = struct.Struct('<4sIIqqI')
+_BYTE_ORDER = 1 if sys.byteorder == 'little' else 2
+_SECTIONS = 11
+
+
+def _parse_rule(item):
+    """Reguła z JSON: {"premises": [...], "conclusion": "..."} albo [[przesłanki], wniosek]"""
+    if isinstance(item, dict):
+        premises, conclusion = item.get('premises'), item.get('conclusion')
+    elif isinstance(item, list) and len(item) == 2:
+        premises, conclusion = item
+    else:
+        raise ValueError("expected {'premises': [...], 'conclusion': ...} or [premises, conclusion]")
+
+    if not isinstance(conclusion, str) or not conclusion.strip():
+        raise ValueError("conclusion must be a non-empty string")
+    if not isinstance(premises, list) or not all(isinstance(p, str) and p.strip() for p in premises):
+        raise ValueError("premises must be a list of non-empty strings")
+    return [p.strip() for p in premises], conclusion.strip()
+
+
+def read_json(file, errors):
+    """JSON: {"rules": [...], "recommendations": {wniosek: zalecenie}}"""
+    data = json.load(file)
+    rules = []
+    recommendations = {}
+    if not isinstance(data, dict):
+        errors.append(("file", "expected an object with 'rules' and 'recommendations'"))
+        return rules, recommendations
+
+    items = data.get('rules', [])
+    if not isinstance(items, list):
+        errors.append(("rules", "rules must be a list"))
+        items = []
+    for n, item in enumerate(items, 1):
+        try:
+            rules.append(_parse_rule(item))
+        except ValueError as e:
+            errors.append((f"rule {n}", str(e)))
+
+    texts = data.get('recommendations', {})
+    if not isinstance(texts, dict):
+        errors.append(("recommendations", "recommendations must be an object"))
+        texts = {}
+    for conclusion, text in texts.items():
+        if isinstance(text, str):
+            recommendations[conclusion.strip()] = text
+        else:
+            errors.append((f"recommendation '{conclusion}'", "recommendation must be a string"))
+    return rules, recommendations
+
+
+def read_csv(file, errors):
+    """CSV z nagłówkiem: conclusion, premises (rozdzielone ';') i opcjonalnie recommendation"""
+    reader = csv.DictReader(file)
+    if not reader.fieldnames or not {'conclusion', 'premises'} <= set(reader.fieldnames):
+        raise ValueError("CSV header must contain 'conclusion' and 'premises' columns")
+
+    rules = []
+    recommendations = {}
+    for row in reader:
+        location = f"line {reader.line_num}"
+        try:
+            premises = [p for p in (row['premises'] or '').split(';') if p.strip()]
+            premises, conclusion = _parse_rule([premises, row['conclusion'] or ''])
+        except ValueError as e:
+            errors.append((location, str(e)))
+            continue
+        rules.append((premises, conclusion))
+
+        text = (row.get('recommendation') or '').strip()
+        if text:
+            if recommendations.get(conclusion, text) != text:
+                errors.append((location, f"conflicting recommendation for '{conclusion}'"))
+            recommendations.setdefault(conclusion, text)
+    return rules, recommendations
+
+
+def read_rules(path, errors=None):
+    """Wczytuje reguły i zalecenia z pliku .json albo .csv - zwraca (rules, recommendations).
+
+    Błędne reguły są pomijane i dopisywane do listy errors jako (miejsce w pliku, błąd).
+    Plik, którego nie da się odczytać (błędny JSON, zły nagłówek CSV), daje jeden błąd
+    w postaci (plik:wiersz, błąd) i pustą bazę.
+    """
+    errors = [] if errors is None else errors
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        try:
+            if path.lower().endswith('.csv'):
+                return read_csv(file, errors)
+            return read_json(file, errors)
+        except json.JSONDecodeError as e:
+            errors.append((f"{path}:{e.lineno}", f"invalid JSON: {e.msg} (column {e.colno})"))
+        except ValueError as e:
+            errors.append((f"{path}:1", str(e)))
+    return [], {}
+
+
+def validate(compiled):
+    """Ostrzeżenia o bazie reguł: brakujące i zbędne zalecenia, niewywodliwe wnioski, powtórzone reguły"""
+    warnings = []
+    symbols = compiled.symbols
+    conclusions = set(compiled.rule_conclusion)
+
+    seen = set()
+    for rule_id, premises in enumerate(compiled.rule_premises):
+        key = (frozenset(premises), compiled.rule_conclusion[rule_id])
+        if key in seen:
+            warnings.append(f"duplicate rule {rule_id + 1} for '{symbols[key[1]]}'")
+        seen.add(key)
+
+    for c in sorted(conclusions):
+        if c not in compiled.recommendations:
+            warnings.append(f"no recommendation for '{symbols[c]}'")
+    for c in sorted(compiled.recommendations):
+        if c not in conclusions:
+            warnings.append(f"recommendation for '{symbols[c]}' which no rule concludes")
+
+    # Wniosek jest osiągalny, jeśli wynika z kompletu objawów (symboli, których żadna reguła nie wywodzi)
+    base = [s for i, s in enumerate(symbols) if i not in conclusions]
+    reachable, _ = forward_chaining_compiled(compiled, base)
+    for c in sorted(conclusions):
+        if symbols[c] not in reachable:
+            warnings.append(f"'{symbols[c]}' can never be inferred (its rules depend on each other)")
+    return warnings
+
+
+def report_problems(problems, title, limit=20):
+    """Wypisuje zebrane błędy lub ostrzeżenia jednym blokiem"""
+    if not problems:
+        return
+    print(f"{title} ({len(problems)}):")
+    for problem in problems[:limit]:
+        print("  " + (f"{problem[0]}: {problem[1]}" if isinstance(problem, tuple) else problem))
+    if len(problems) > limit:
+        print(f"  ... and {len(problems) - limit} more")
+
+
+def _csr(lists):
+    offsets = array('i', [0])
+    values = array('i')
+    for items in lists:
+        values.extend(items)
+        offsets.append(len(values))
+    return offsets, values
+
+
+def _strings(items):
+    for s in items:
+        if '\0' in s:
+            raise ValueError(f"symbol {s!r} contains a NUL character")
+    return '\0'.join(items).encode('utf-8')
+
+
+def write_compiled(compiled, path, source_signature=(0, 0)):
+    """Zapisuje skompilowaną bazę do pliku binarnego: tablice int32 indeksów i teksty symboli"""
+    rec_ids = sorted(compiled.recommendations)
+    sections = [
+        _strings(compiled.symbols),
+        *_csr(compiled.rule_premises),
+        array('i', compiled.rule_conclusion),
+        *_csr(compiled.premise_index),
+        *_csr(compiled.conclusion_index),
+        array('i', compiled.unconditional),
+        array('i', rec_ids),
+        _strings([compiled.recommendations[c] for c in rec_ids]),
+    ]
+    sections = [bytes(s) for s in sections]
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(COMPILED_MAGIC, COMPILED_VERSION, _BYTE_ORDER, *source_signature, len(sections)))
+        file.write(struct.pack(f'<{len(sections)}Q', *map(len, sections)))
+        for section in sections:
+            file.write(section)
+            file.write(b'\0' * (-len(section) % 8))
+    # Podmiana na końcu - niedokończony plik nie zastąpi poprzedniego
+    os.replace(tmp_path, path)
+
+
+def load_compiled(path, source_signature=None):
+    """Otwiera plik .rbc przez mmap - indeksy reguł są widokami na plik, bez kopiowania.
+
+    Przy podanym source_signature zwraca None, jeśli plik powstał z innej wersji źródła.
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, version, byte_order, size, mtime_ns, count = _HEADER.unpack_from(buffer)
+    if magic != COMPILED_MAGIC or version != COMPILED_VERSION or count != _SECTIONS:
+        buffer.close()
+        raise ValueError(f"{path} is not a compiled rule base")
+    if byte_order != _BYTE_ORDER:
+        buffer.close()
+        raise ValueError(f"{path} was compiled on a machine with a different byte order")
+    if source_signature is not None and (size, mtime_ns) != tuple(source_signature):
+        buffer.close()
+        return None
+
+    lengths = struct.unpack_from(f'<{count}Q', buffer, _HEADER.size)
+    view = memoryview(buffer)
+    sections = []
+    offset = _HEADER.size + 8 * count
+    for length in lengths:
+        sections.append(view[offset:offset + length])
+        offset += length + (-length % 8)
+
+    def ints(section):
+        return section.cast('i')
+
+    def strings(section):
+        text = str(section, 'utf-8')
+        return text.split('\0') if text else []
+
+    (symbols, premise_offsets, premise_ids, conclusions, pi_offsets, pi_rules,
+     ci_offsets, ci_rules, unconditional, rec_ids, rec_texts) = sections
+    rec_ids = ints(rec_ids)
+    return CompiledRules.from_arrays(
+        strings(symbols),
+        CsrLists(ints(premise_offsets), ints(premise_ids)),
+        ints(conclusions),
+        CsrLists(ints(pi_offsets), ints(pi_rules)),
+        CsrLists(ints(ci_offsets), ints(ci_rules)),
+        ints(unconditional),
+        dict(zip(rec_ids, strings(rec_texts))),
+    )
+
+
+def load_rule_base(path, use_compiled=True, error_limit=20):
+    """Wczytuje bazę reguł, korzystając ze skompilowanego pliku <plik>.rbc, jeśli jest aktualny.
+
+    Przy kompilacji wypisuje błędy i ostrzeżenia walidacji; plik z błędami nie jest zapisywany
+    jako .rbc. Plik .rbc podany wprost jest otwierany bez sprawdzania źródła.
+    """
+    if path.endswith(COMPILED_SUFFIX):
+        return load_compiled(path)
+
+    stat = os.stat(path)
+    signature = (stat.st_size, stat.st_mtime_ns)
+    compiled_path = path + COMPILED_SUFFIX
+    if use_compiled:
+        try:
+            compiled = load_compiled(compiled_path, signature)
+        except (OSError, ValueError, struct.error):
+            compiled = None
+        if compiled is not None:
+            return compiled
+
+    errors = []
+    rules, recommendations = read_rules(path, errors)
+    compiled = CompiledRules(rules, recommendations)
+    report_problems(errors, "Problems in rule file", error_limit)
+    report_problems(validate(compiled), "Rule base warnings", error_limit)
+
+    # Plik z błędami nie trafia do pamięci podręcznej - inaczej błędy nie zostałyby wypisane ponownie
+    if use_compiled and not errors:
+        try:
+            write_compiled(compiled, compiled_path, signature)
+        except (OSError, ValueError) as e:
+            print(f"Could not write compiled rule base {compiled_path}: {e}")
+    return compiled
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walidacja i kompilacja bazy reguł z pliku JSON/CSV")
+    parser.add_argument('file', help="plik .json albo .csv z regułami")
+    parser.add_argument('-o', '--output', help=f"plik wynikowy (domyślnie <plik>{COMPILED_SUFFIX})")
+    parser.add_argument('--error-limit', type=int, default=20)
+    args = parser.parse_args(argv)
+
+    errors = []
+    rules, recommendations = read_rules(args.file, errors)
+    compiled = CompiledRules(rules, recommendations)
+    report_problems(errors, "Problems in rule file", args.error_limit)
+    report_problems(validate(compiled), "Rule base warnings", args.error_limit)
+    if errors:
+        return 1
+
+    stat = os.stat(args.file)
+    output = args.output or args.file + COMPILED_SUFFIX
+    write_compiled(compiled, output, (stat.st_size, stat.st_mtime_ns))
+    print(f"{len(compiled)} rules, {len(compiled.symbols)} symbols -> {output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,102 @@
+from RuleBase import CompiledRules
+
+
+class InferenceSession:
+    """Długotrwała sesja wnioskowania - objawy dodawane i wycofywane pojedynczo.
+
+    Wnioski są aktualizowane przyrostowo: każda reguła ma licznik niespełnionych
+    przesłanek, a wnioski, których podstawa zniknęła, usuwane są metodą DRed - najpierw
+    usuwamy wszystko, co mogło zależeć od wycofanego faktu, potem przywracamy to, co da
+    się wywieść z pozostałych. Koszt zależy od liczby dotkniętych reguł, nie od całej bazy.
+    """
+
+    def __init__(self, rules, recommendations=None, facts=()):
+        self.compiled = rules if isinstance(rules, CompiledRules) else CompiledRules(rules, recommendations)
+        compiled = self.compiled
+        self.asserted = set()
+        self.asserted_ids = set()
+        self.inferred_ids = set()
+        self.missing = [len(p) for p in compiled.rule_premises]
+
+        self._add([compiled.rule_conclusion[r] for r in compiled.unconditional])
+        for fact in facts:
+            self.assert_fact(fact)
+
+    def _add(self, agenda):
+        """Dodaje symbole i odpala reguły, które przez to zostały spełnione - zwraca dodane"""
+        compiled = self.compiled
+        added = set()
+        while agenda:
+            symbol_id = agenda.pop()
+            if symbol_id in self.inferred_ids:
+                continue
+            self.inferred_ids.add(symbol_id)
+            added.add(symbol_id)
+            for rule_id in compiled.premise_index[symbol_id]:
+                self.missing[rule_id] -= 1
+                if self.missing[rule_id] == 0:
+                    agenda.append(compiled.rule_conclusion[rule_id])
+        return added
+
+    def assert_fact(self, fact):
+        """Dodaje fakt - zwraca zbiór nowych symboli (fakt i nowe wnioski)"""
+        if fact in self.asserted:
+            return set()
+        self.asserted.add(fact)
+        symbol_id = self.compiled.symbol_ids.get(fact)
+        if symbol_id is None:
+            return {fact}
+        self.asserted_ids.add(symbol_id)
+        return {self.compiled.symbols[s] for s in self._add([symbol_id])}
+
+    def retract_fact(self, fact):
+        """Wycofuje fakt - zwraca zbiór symboli, które przestały obowiązywać"""
+        if fact not in self.asserted:
+            return set()
+        self.asserted.remove(fact)
+        symbol_id = self.compiled.symbol_ids.get(fact)
+        if symbol_id is None:
+            return {fact}
+        self.asserted_ids.remove(symbol_id)
+        compiled = self.compiled
+
+        # Usuwamy fakt i wszystkie wnioski reguł, które przez to przestały być spełnione
+        removed = set()
+        queue = [symbol_id]
+        while queue:
+            s = queue.pop()
+            if s not in self.inferred_ids:
+                continue
+            self.inferred_ids.remove(s)
+            removed.add(s)
+            for rule_id in compiled.premise_index[s]:
+                if self.missing[rule_id] == 0:
+                    conclusion = compiled.rule_conclusion[rule_id]
+                    if conclusion not in self.asserted_ids:
+                        queue.append(conclusion)
+                self.missing[rule_id] += 1
+
+        # Przywracamy to, co nadal wynika z pozostałych faktów
+        agenda = [s for s in removed
+                  if any(self.missing[rule_id] == 0 for rule_id in compiled.conclusion_index[s])]
+        removed -= self._add(agenda)
+        return {compiled.symbols[s] for s in removed}
+
+    def inferred(self):
+        """Wszystkie obowiązujące fakty i wnioski (jak inferred z forward_chaining)"""
+        return self.asserted | {self.compiled.symbols[s] for s in self.inferred_ids}
+
+    def recommendations(self):
+        """Zalecenia dla wywiedzionych wniosków (jak recommendations_found z forward_chaining)"""
+        compiled = self.compiled
+        return {compiled.recommendations[s] for s in self.inferred_ids
+                if s not in self.asserted_ids and s in compiled.recommendations}
+
+    def justifications(self, symbol):
+        """Przesłanki reguł, które w tej chwili wywodzą symbol"""
+        compiled = self.compiled
+        symbol_id = compiled.symbol_ids.get(symbol)
+        if symbol_id is None:
+            return []
+        return [[compiled.symbols[p] for p in compiled.rule_premises[rule_id]]
+                for rule_id in compiled.conclusion_index[symbol_id] if self.missing[rule_id] == 0]
@@ -0,0 +1,70 @@
+import argparse
+import random
+import time
+
+import Main
+from RuleBase import CompiledRules, forward_chaining_compiled
+
+
+def random_rule_base(n_rules, n_symptoms=2000, max_premises=4, chain_ratio=0.3, seed=0):
+    """Losowa baza reguł: część reguł ma w przesłankach wnioski innych reguł (łańcuchy)"""
+    rng = random.Random(seed)
+    symptoms = [f"objaw {i}" for i in range(n_symptoms)]
+    rules = []
+    recommendations = {}
+    for i in range(n_rules):
+        premises = rng.sample(symptoms, rng.randint(1, max_premises))
+        if rules and rng.random() < chain_ratio:
+            premises[0] = rules[rng.randrange(len(rules))][1]
+        conclusion = f"stan {i}"
+        rules.append((premises, conclusion))
+        if rng.random() < 0.5:
+            recommendations[conclusion] = f"zalecenie {i}"
+    return rules, recommendations, symptoms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie forward_chaining: skan reguł vs indeks przesłanek")
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000, 10000, 50000])
+    parser.add_argument('--facts', type=int, default=300, help="liczba faktów w zapytaniu")
+    parser.add_argument('--scan-limit', type=int, default=50000,
+                        help="największa liczba reguł, dla której uruchamiany jest skan")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'reguły':>8} | {'kompilacja [s]':>14} | {'skan [s]':>10} | {'indeks [s]':>10} | "
+          f"{'przyspieszenie':>14} | wynik")
+    for n in args.sizes:
+        rules, recommendations, symptoms = random_rule_base(n, seed=args.seed)
+        facts = set(random.Random(args.seed).sample(symptoms, min(args.facts, len(symptoms))))
+
+        start = time.perf_counter()
+        compiled = CompiledRules(rules, recommendations)
+        compile_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = forward_chaining_compiled(compiled, facts)
+        indexed_time = time.perf_counter() - start
+
+        if n > args.scan_limit:
+            print(f"{n:8d} | {compile_time:14.3f} | {'-':>10} | {indexed_time:10.4f} | {'-':>14} | "
+                  f"{len(result[0]) - len(facts)} wniosków")
+            continue
+
+        # forward_chaining czyta zalecenia z modułu Main
+        original = Main.recommendations
+        Main.recommendations = recommendations
+        try:
+            start = time.perf_counter()
+            expected = Main.forward_chaining(rules, facts)
+            scan_time = time.perf_counter() - start
+        finally:
+            Main.recommendations = original
+
+        same = "identyczny" if result == expected else "RÓŻNY"
+        print(f"{n:8d} | {compile_time:14.3f} | {scan_time:10.3f} | {indexed_time:10.4f} | "
+              f"{scan_time / indexed_time:13.1f}x | {same}")
+
+
+if __name__ == '__main__':
+    main()
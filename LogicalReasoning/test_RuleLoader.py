@@ -0,0 +1,47 @@
+import os
+
+from RuleLoader import COMPILED_SUFFIX, load_rule_base, main, read_rules
+
+
+def write(tmp_path, name, text):
+    path = tmp_path / name
+    path.write_text(text, encoding='utf-8')
+    return str(path)
+
+
+def test_invalid_json_is_reported(tmp_path):
+    path = write(tmp_path, 'rules.json', '{\n  bad')
+    errors = []
+    assert read_rules(path, errors) == ([], {})
+    assert len(errors) == 1
+    location, message = errors[0]
+    assert location == f"{path}:2"
+    assert message.startswith("invalid JSON:") and "column 3" in message
+
+
+def test_csv_without_required_columns_is_reported(tmp_path):
+    path = write(tmp_path, 'rules.csv', 'disease,symptoms\nflu,fever\n')
+    errors = []
+    assert read_rules(path, errors) == ([], {})
+    assert errors == [(f"{path}:1", "CSV header must contain 'conclusion' and 'premises' columns")]
+
+
+def test_json_with_wrong_structure_is_reported(tmp_path):
+    path = write(tmp_path, 'rules.json', '{"rules": {"a": 1}, "recommendations": []}')
+    errors = []
+    assert read_rules(path, errors) == ([], {})
+    assert [location for location, _ in errors] == ["rules", "recommendations"]
+
+
+def test_main_reports_malformed_file_and_exits_1(tmp_path, capsys):
+    path = write(tmp_path, 'rules.json', '{bad')
+    assert main([path]) == 1
+    assert f"{path}:1: invalid JSON:" in capsys.readouterr().out
+    assert not os.path.exists(path + COMPILED_SUFFIX)
+
+
+def test_load_rule_base_does_not_cache_malformed_file(tmp_path, capsys):
+    path = write(tmp_path, 'rules.csv', 'conclusion\nflu\n')
+    assert len(load_rule_base(path)) == 0
+    assert "Problems in rule file (1):" in capsys.readouterr().out
+    assert not os.path.exists(path + COMPILED_SUFFIX)
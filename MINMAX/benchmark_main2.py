@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+from main2 import MinMaxAI, Player, TicTacToeGame
+
+
+def random_games(count, seed=0):
+    """Losowe trwające partie (od 0 do 4 ruchów), zawsze z pustą planszą"""
+    rng = random.Random(seed)
+    games = [TicTacToeGame()]
+    while len(games) < count:
+        game = TicTacToeGame()
+        player = Player.X
+        for _ in range(rng.randint(1, 4)):
+            row, col = rng.choice(game.get_available_moves())
+            game.make_move(row, col, player)
+            player = Player.O if player == Player.X else Player.X
+        if not game.is_game_over()[0]:
+            games.append(game)
+    return games
+
+
+def measure(method_name, run):
+    """Uruchamia run() licząc wywołania MinMaxAI.method_name - zwraca (wynik, węzły, czas)"""
+    original = getattr(MinMaxAI, method_name)
+    nodes = 0
+
+    def counted(self, *args):
+        nonlocal nodes
+        nodes += 1
+        return original(self, *args)
+
+    setattr(MinMaxAI, method_name, counted)
+    try:
+        result = run()
+    finally:
+        setattr(MinMaxAI, method_name, original)
+
+    start = time.perf_counter()
+    run()
+    return result, nodes, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Węzły na sekundę MinMaxAI: kopiowanie planszy vs ruch i cofnięcie")
+    parser.add_argument('depths', nargs='*', type=int, default=[2, 4, 9])
+    parser.add_argument('--games', type=int, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    ai = MinMaxAI()
+    games = random_games(args.games, args.seed)
+    print(f"{'głębokość':>9} | {'węzły kopie':>11} | {'węzły w miejscu':>15} | {'kopie [węzły/s]':>15} | "
+          f"{'w miejscu [węzły/s]':>19} | {'przyspieszenie':>14} | ruchy")
+    for depth in args.depths:
+        def cloning():
+            return [ai._find_best_move_cloning(g, player, opponent, depth)
+                    for g in games for player, opponent in ((Player.X, Player.O), (Player.O, Player.X))]
+
+        def in_place():
+            return [ai.find_best_move(g, player, depth) for g in games for player in (Player.X, Player.O)]
+
+        expected, nodes, clone_time = measure('minimax', cloning)
+        moves, search_nodes, search_time = measure('search', in_place)
+
+        # find_best_move przekazuje alfę między ruchami w korzeniu, więc odwiedza mniej węzłów
+        same = "identyczne" if moves == expected else "RÓŻNE"
+        print(f"{depth:9d} | {nodes:11d} | {search_nodes:15d} | {nodes / clone_time:15.0f} | "
+              f"{search_nodes / search_time:19.0f} | {clone_time / search_time:13.1f}x | {same}")
+
+
+if __name__ == '__main__':
+    main()
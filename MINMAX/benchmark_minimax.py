@@ -0,0 +1,92 @@
+import argparse
+import math
+import random
+import time
+
+import bitboard
+import main
+from transposition import TranspositionTable
+
+
+def list_best_move(board, max_depth):
+    """Dawne best_move - przeszukiwanie minimax z main.py na liście pól"""
+    best_score = -math.inf
+    best = None
+    for i in range(9):
+        if board[i] == ' ':
+            board[i] = 'X'
+            score = main.minimax(board, 0, max_depth, -math.inf, math.inf, False)
+            board[i] = ' '
+            if score > best_score:
+                best_score = score
+                best = i
+    return best
+
+
+def random_positions(count, seed=0):
+    """Losowe pozycje z ruchem X (tyle samo X i O, bez zwycięzcy), zawsze z pustą planszą"""
+    rng = random.Random(seed)
+    positions = [[' '] * 9]
+    while len(positions) < count:
+        board = [' '] * 9
+        for turn, i in enumerate(rng.sample(range(9), 2 * rng.randint(1, 3))):
+            board[i] = 'XO'[turn % 2]
+        if main.check_winner(board) is None:
+            positions.append(board)
+    return positions
+
+
+def count_nodes(module, name, run):
+    """Uruchamia run() licząc wywołania funkcji module.name - zwraca (wynik, węzły)"""
+    original = getattr(module, name)
+    nodes = 0
+
+    def counted(*args):
+        nonlocal nodes
+        nodes += 1
+        return original(*args)
+
+    setattr(module, name, counted)
+    try:
+        result = run()
+    finally:
+        setattr(module, name, original)
+    return result, nodes
+
+
+def timed(run):
+    start = time.perf_counter()
+    result = run()
+    return result, time.perf_counter() - start
+
+
+def run_benchmark():
+    parser = argparse.ArgumentParser(description="Porównanie best_move: lista pól vs bitboard")
+    parser.add_argument('depths', nargs='*', type=int, default=[2, 4, 6, 9])
+    parser.add_argument('--positions', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, args.seed)
+    print(f"{'głębokość':>9} | {'węzły lista':>11} | {'węzły bity':>10} | {'lista [s]':>10} | {'bity [s]':>10} | "
+          f"{'przyspieszenie':>14} | {'bity+TT [s]':>11} | ruchy")
+    for depth in args.depths:
+        # Węzły liczone osobno - opakowanie licznika nie powinno wpływać na pomiar czasu
+        _, nodes = count_nodes(main, 'minimax', lambda: [list_best_move(b, depth) for b in positions])
+        _, bit_nodes = count_nodes(bitboard, 'minimax',
+                                      lambda: [bitboard.best_move(*bitboard.board_to_bits(b), depth)
+                                               for b in positions])
+        expected, list_time = timed(lambda: [list_best_move(b, depth) for b in positions])
+        moves, bit_time = timed(lambda: [main.best_move(b, depth) for b in positions])
+        # Jedna tablica transpozycji na wszystkie pozycje, jak przez całą partię
+        table = TranspositionTable()
+        tt_moves, tt_time = timed(lambda: [main.best_move(b, depth, table) for b in positions])
+
+        # Bitboard przekazuje alfę między ruchami w korzeniu, więc odwiedza mniej węzłów
+        same = "identyczne" if moves == expected == tt_moves else "RÓŻNE"
+        print(f"{depth:9d} | {nodes:11d} | {bit_nodes:10d} | {list_time:10.3f} | {bit_time:10.3f} | "
+              f"{list_time / bit_time:13.1f}x | {tt_time:11.3f} | {same}")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+from main2 import Player
+from mnk import MNKAI, MNKGame
+from parallel import RootSplitter
+
+
+def random_positions(count, size, k, stones, seed=0):
+    """Losowe trwające partie: pierwszy kamień na środku, kolejne obok już zajętych pól"""
+    rng = random.Random(seed)
+    positions = []
+    while len(positions) < count:
+        game = MNKGame(size, k)
+        player = Player.X
+        game.make_move(size // 2, size // 2, player)
+        for _ in range(stones - 1):
+            player = Player.O if player == Player.X else Player.X
+            occupied = [(row, col) for row in range(size) for col in range(size)
+                        if game.board[row][col] != Player.None_]
+            row, col = rng.choice(occupied)
+            free = [(row + dr, col + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                    if 0 <= row + dr < size and 0 <= col + dc < size
+                    and game.board[row + dr][col + dc] == Player.None_]
+            if free:
+                game.make_move(*rng.choice(free), player)
+        if not game.is_game_over()[0]:
+            positions.append((game, Player.O if player == Player.X else Player.X))
+    return positions
+
+
+def run(positions, depth, splitter=None):
+    """Przeszukuje wszystkie pozycje do głębokości depth - zwraca (oceny, węzły, czas)"""
+    scores = []
+    nodes = 0
+    start = time.perf_counter()
+    for game, player in positions:
+        # Limit czasu na tyle duży, żeby zawsze dojść do depth
+        ai = MNKAI(time_limit=1e9, splitter=splitter)
+        ai.find_best_move(game, player, depth)
+        scores.append(ai.best_score)
+        nodes += ai.nodes
+    return scores, nodes, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MNKAI: przeszukiwanie szeregowe vs podział korzenia (RootSplitter)")
+    parser.add_argument('depths', nargs='*', type=int, default=[2, 3, 4])
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--size', type=int, default=9)
+    parser.add_argument('-k', type=int, default=5)
+    parser.add_argument('--stones', type=int, default=6)
+    parser.add_argument('--positions', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    positions = random_positions(args.positions, args.size, args.k, args.stones, args.seed)
+    with RootSplitter(args.workers) as splitter:
+        # Rozgrzanie puli, żeby start procesów nie liczył się do czasu
+        run(positions[:1], 1, splitter)
+        print(f"{'głębokość':>9} | {'węzły szeregowo':>15} | {'węzły równolegle':>16} | {'czas szeregowo':>14} | "
+              f"{'czas równolegle':>15} | {'przyspieszenie':>14} | oceny")
+        for depth in args.depths:
+            expected, serial_nodes, serial_time = run(positions, depth)
+            scores, split_nodes, split_time = run(positions, depth, splitter)
+
+            same = "identyczne" if scores == expected else "RÓŻNE"
+            print(f"{depth:9d} | {serial_nodes:15d} | {split_nodes:16d} | {serial_time:13.2f}s | "
+                  f"{split_time:14.2f}s | {serial_time / split_time:13.1f}x | {same}")
+
+
+if __name__ == '__main__':
+    main()
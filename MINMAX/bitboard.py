@@ -0,0 +1,220 @@
+import math
+import sys
+
+from search_stats import measure
+from transposition import TranspositionTable, canonical
+
+# Pozycja to dwie 9-bitowe liczby (pola X i pola O); bit i odpowiada polu i planszy
+FULL = 0b111111111
+
+WIN_LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+]
+WIN_MASKS = [sum(1 << i for i in line) for line in WIN_LINES]
+
+
+def _first_win(stones):
+    for k, mask in enumerate(WIN_MASKS):
+        if stones & mask == mask:
+            return k
+    return len(WIN_MASKS)
+
+
+# FIRST_WIN[pola] - numer pierwszej pełnej linii (jak w check_winner) albo 8, gdy jej nie ma
+FIRST_WIN = [_first_win(stones) for stones in range(1 << 9)]
+# OPEN_LINES[pola przeciwnika] - liczba linii, w których przeciwnik nie ma żadnego pola
+OPEN_LINES = [sum(1 for mask in WIN_MASKS if not stones & mask) for stones in range(1 << 9)]
+NO_WIN = len(WIN_MASKS)
+# POPCOUNT[pola] - liczba zajętych pól
+POPCOUNT = [bin(stones).count('1') for stones in range(1 << 9)]
+
+# Tablica najlepszych ruchów: bajt (x << 9 | o) to najlepsze pole dla X albo NO_MOVE
+PERFECT_PLAY_SIZE = 1 << 18
+NO_MOVE = 255
+
+
+def board_to_bits(board):
+    """Plansza jako lista 9 pól ('X', 'O', ' ') -> (pola X, pola O)"""
+    x = o = 0
+    for i, cell in enumerate(board):
+        if cell == 'X':
+            x |= 1 << i
+        elif cell == 'O':
+            o |= 1 << i
+    return x, o
+
+
+def winner(x, o):
+    """To samo co check_winner: 'X', 'O', 'Draw' albo None"""
+    x_line = FIRST_WIN[x]
+    o_line = FIRST_WIN[o]
+    if x_line < o_line:
+        return 'X'
+    if o_line < x_line:
+        return 'O'
+    if x | o == FULL:
+        return 'Draw'
+    return None
+
+
+def evaluate(x, o):
+    """To samo co evaluate_board: +-10 za wygraną, 0 za remis, inaczej różnica otwartych linii"""
+    x_line = FIRST_WIN[x]
+    o_line = FIRST_WIN[o]
+    if x_line < o_line:
+        return 10
+    if o_line < x_line:
+        return -10
+    if x | o == FULL:
+        return 0
+    return OPEN_LINES[o] - OPEN_LINES[x]
+
+
+def minimax(x, o, depth, max_depth, alpha, beta, is_maximizing, table=None, tracer=None, stats=None):
+    """Alfa-beta jak minimax z main.py, ale na bitach - te same wartości i te same cięcia.
+
+    Z tablicą transpozycji pozycje symetryczne oceniane są raz. Kluczem jest pozycja
+    kanoniczna, strona na ruchu i efektywna głębokość min(pozostała głębokość, wolne pola)
+    - przy większej głębokości i tak dochodzimy do końca gry.
+    tracer (tree_export.TreeTracer) zapisuje odwiedzone węzły, stats (search_stats.SearchStats)
+    je liczy - korzeń best_move ma głębokość 0, więc węzeł z depth jest na głębokości depth + 1.
+    """
+    if stats is not None:
+        stats.node(depth + 1)
+    x_line = FIRST_WIN[x]
+    o_line = FIRST_WIN[o]
+    if x_line < o_line:
+        return 10
+    if o_line < x_line:
+        return -10
+    occupied = x | o
+    if occupied == FULL:
+        return 0
+    if depth == max_depth:
+        return OPEN_LINES[o] - OPEN_LINES[x]
+
+    if table is not None:
+        key = (canonical(x, o) * 2 + is_maximizing) * 10 + min(max_depth - depth, 9 - POPCOUNT[occupied])
+        value = table.probe(key, alpha, beta)
+        if stats is not None:
+            stats.probe(value is not None)
+        if value is not None:
+            return value
+        alpha_start, beta_start = alpha, beta
+
+    if is_maximizing:
+        best = -math.inf
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                if tracer is not None:
+                    tracer.enter(i)
+                eval = minimax(x | bit, o, depth + 1, max_depth, alpha, beta, False, table, tracer, stats)
+                if tracer is not None:
+                    tracer.exit(eval)
+                if eval > best:
+                    best = eval
+                if eval > alpha:
+                    alpha = eval
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(depth + 1)
+                    break
+    else:
+        best = math.inf
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                if tracer is not None:
+                    tracer.enter(i)
+                eval = minimax(x, o | bit, depth + 1, max_depth, alpha, beta, True, table, tracer, stats)
+                if tracer is not None:
+                    tracer.exit(eval)
+                if eval < best:
+                    best = eval
+                if eval < beta:
+                    beta = eval
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(depth + 1)
+                    break
+
+    if table is not None:
+        table.store(key, best, alpha_start, beta_start)
+    return best
+
+
+def perfect_move(x, o, max_depth, perfect):
+    """Ruch z tablicy najlepszych ruchów (load_perfect_play), gdy max_depth sięga końca gry, inaczej None"""
+    if perfect is not None and max_depth >= 8 - POPCOUNT[x | o]:
+        move = perfect[x << 9 | o]
+        if move != NO_MOVE:
+            return move
+    return None
+
+
+def best_move(x, o, max_depth, table=None, perfect=None, tracer=None, stats=None):
+    """Najlepszy ruch X - pierwsze pole z najwyższą oceną, jak best_move z main.py.
+
+    perfect to tablica z load_perfect_play; używana, gdy max_depth sięga końca gry.
+    """
+    move = perfect_move(x, o, max_depth, perfect)
+    if move is not None:
+        return move
+
+    occupied = x | o
+    if tracer is not None:
+        tracer.enter(None)
+    # Ruch nie lepszy od najlepszego dotąd nie zostanie wybrany, więc wystarczy okno (best_score, inf)
+    best_score = -math.inf
+    best = None
+    with measure(stats, max_depth):
+        if stats is not None:
+            stats.node(0)
+        for i in range(9):
+            bit = 1 << i
+            if not occupied & bit:
+                if tracer is not None:
+                    tracer.enter(i)
+                score = minimax(x | bit, o, 0, max_depth, best_score, math.inf, False, table, tracer, stats)
+                if tracer is not None:
+                    tracer.exit(score)
+                if score > best_score:
+                    best_score = score
+                    best = i
+    if tracer is not None:
+        tracer.exit(best_score)
+    return best
+
+
+def build_perfect_play():
+    """Najlepszy ruch X dla każdej pozycji w trakcie gry (X zaczyna albo odpowiada na O)"""
+    perfect = bytearray([NO_MOVE]) * PERFECT_PLAY_SIZE
+    table = TranspositionTable()
+    for x in range(1 << 9):
+        for o in range(1 << 9):
+            if x & o or POPCOUNT[o] - POPCOUNT[x] not in (0, 1) or winner(x, o) is not None:
+                continue
+            perfect[x << 9 | o] = best_move(x, o, 9, table)
+    return perfect
+
+
+def save_perfect_play(path, perfect=None):
+    with open(path, 'wb') as file:
+        file.write(perfect if perfect is not None else build_perfect_play())
+
+
+def load_perfect_play(path):
+    with open(path, 'rb') as file:
+        perfect = file.read()
+    if len(perfect) != PERFECT_PLAY_SIZE:
+        raise ValueError(f"{path} is not a perfect-play table")
+    return perfect
+
+
+if __name__ == '__main__':
+    output = sys.argv[1] if len(sys.argv) > 1 else 'perfect_play.bin'
+    save_perfect_play(output)
+    print(f"Zapisano tablicę najlepszych ruchów do {output}")
@@ -1,6 +1,13 @@
 import math
+import os
 import random
 
+import bitboard
+from transposition import TranspositionTable
+
+# Plik z bitboard.py (python bitboard.py perfect_play.bin) - jeśli istnieje, AI nie musi liczyć
+PERFECT_PLAY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perfect_play.bin')
+
 
 def print_board(board):
     print()
@@ -82,18 +89,19 @@ def minimax(board, depth, max_depth, alpha, beta, is_maximizing):
         return min_eval
 
 
-def best_move(board, max_depth):
-    best_score = -math.inf
-    best_move = None
-    for i in range(9):
-        if board[i] == ' ':
-            board[i] = 'X'
-            score = minimax(board, 0, max_depth, -math.inf, math.inf, False)
-            board[i] = ' '
-            if score > best_score:
-                best_score = score
-                best_move = i
-    return best_move
+def best_move(board, max_depth, table=None, perfect=None, splitter=None, tracer=None, stats=None):
+    # Przeszukiwanie na bitach (bitboard.py) - wynik taki sam jak z minimax na liście pól;
+    # table (TranspositionTable), perfect (tablica najlepszych ruchów) i splitter
+    # (parallel.RootSplitter - ruchy w korzeniu na wielu procesach) tylko przyspieszają.
+    # Ze splitterem table nie jest używana - procesy robocze mają własne tablice, zachowywane
+    # między ruchami; perfect działa tak samo jak bez niego.
+    # tracer (tree_export.TreeTracer) zapisuje drzewo przeszukiwania, a stats
+    # (search_stats.SearchStats) zbiera statystyki - oba tylko bez splittera
+    x, o = bitboard.board_to_bits(board)
+    if splitter is not None:
+        move = bitboard.perfect_move(x, o, max_depth, perfect)
+        return move if move is not None else splitter.best_move_bits(x, o, max_depth)
+    return bitboard.best_move(x, o, max_depth, table, perfect, tracer, stats)
 
 
 def player_move(board):
@@ -117,11 +125,15 @@ def play_game():
     max_depth = int(input("Podaj maksymalną głębokość przeszukiwania dla AI (1-9): "))
     max_depth = max(1, min(9, max_depth))
 
+    # Tablica transpozycji zostaje między ruchami - kolejne ruchy korzystają z poprzednich ocen
+    table = TranspositionTable()
+    perfect = bitboard.load_perfect_play(PERFECT_PLAY_FILE) if os.path.exists(PERFECT_PLAY_FILE) else None
+
     current_player = 'X'
 
     while True:
         if current_player == 'X':
-            move = best_move(board, max_depth)
+            move = best_move(board, max_depth, table, perfect)
             board[move] = 'X'
             print(f"\nAI (X) wykonuje ruch na polu {move}:")
         else:
@@ -144,4 +156,5 @@ def play_game():
         current_player = 'O' if current_player == 'X' else 'X'
 
 
-play_game()
\ No newline at end of file
+if __name__ == "__main__":
+    play_game()
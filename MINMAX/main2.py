@@ -2,6 +2,9 @@ from enum import Enum
 from typing import List, Tuple, Optional
 import sys
 
+from search_stats import measure
+from transposition import TranspositionTable, canonical
+
 
 class Player(Enum):
     X = 'X'
@@ -57,6 +60,18 @@ class TicTacToeGame:
                     moves.append((i, j))
         return moves
 
+    def bits(self) -> Tuple[int, int]:
+        """Plansza jako dwie maski bitowe (pola X, pola O); pole (i, j) to bit i * 3 + j"""
+        x = o = 0
+        for i in range(self.board_size):
+            for j in range(self.board_size):
+                cell = self.board[i][j]
+                if cell == Player.X:
+                    x |= 1 << (i * self.board_size + j)
+                elif cell == Player.O:
+                    o |= 1 << (i * self.board_size + j)
+        return x, o
+
     def clone(self) -> 'TicTacToeGame':
         new_game = TicTacToeGame()
         new_game.board = [row.copy() for row in self.board]
@@ -68,12 +83,134 @@ class TicTacToeGame:
         print()
 
 
+def _line_masks(size: int) -> List[Tuple[int, ...]]:
+    """Dla każdego pola (i * size + j) maski bitowe pełnych linii przez to pole"""
+    lines = [[i * size + j for j in range(size)] for i in range(size)]
+    lines += [[i * size + j for i in range(size)] for j in range(size)]
+    lines.append([i * size + i for i in range(size)])
+    lines.append([i * size + size - 1 - i for i in range(size)])
+    masks = [sum(1 << cell for cell in line) for line in lines]
+    return [tuple(mask for line, mask in zip(lines, masks) if cell in line) for cell in range(size * size)]
+
+
+class FlatBoard:
+    """Plansza do przeszukiwania w miejscu: pola graczy jako maski bitowe, ruch i jego cofnięcie"""
+    __slots__ = ('size', 'x', 'o', 'empty', 'lines')
+
+    _lines_cache = {}
+
+    def __init__(self, game: TicTacToeGame):
+        self.size = game.board_size
+        self.x, self.o = game.bits()
+        self.empty = sum(row.count(Player.None_) for row in game.board)
+        if self.size not in FlatBoard._lines_cache:
+            FlatBoard._lines_cache[self.size] = _line_masks(self.size)
+        self.lines = FlatBoard._lines_cache[self.size]
+
+    def make(self, index: int, player: Player) -> None:
+        if player is Player.X:
+            self.x |= 1 << index
+        else:
+            self.o |= 1 << index
+        self.empty -= 1
+
+    def unmake(self, index: int) -> None:
+        mask = ~(1 << index)
+        self.x &= mask
+        self.o &= mask
+        self.empty += 1
+
+    def stones(self, player: Player) -> int:
+        return self.x if player is Player.X else self.o
+
+    def wins_at(self, index: int, player: Player) -> bool:
+        """Czy ruch gracza na pole index zamknął linię - sprawdzamy tylko linie przez to pole"""
+        stones = self.x if player is Player.X else self.o
+        for mask in self.lines[index]:
+            if stones & mask == mask:
+                return True
+        return False
+
+
+def _score_to_node(score: int, ply: int, full: bool) -> int:
+    """Wynik liczony od korzenia (wygrana 10 - głębokość) jako wynik liczony od węzła na głębokości ply.
+
+    Oceny heurystyczne mieszczą się w [-1, 1]; wygrana w przeszukiwaniu obciętym wcześniej niż
+    koniec gry jest warta co najmniej 2, a do końca gry (full) heurystyki nie ma wcale.
+    Przesunięcie jest rosnące, więc zachowuje porównania z alfą i betą.
+    """
+    if score > 1 or (full and score == 1):
+        return score + ply
+    if score < -1 or (full and score == -1):
+        return score - ply
+    return score
+
+
+def _score_to_root(score: int, ply: int, full: bool) -> int:
+    """Odwrotność _score_to_node"""
+    if score > 1 or (full and score == 1):
+        return score - ply
+    if score < -1 or (full and score == -1):
+        return score + ply
+    return score
+
+
 class MinMaxAI:
+    def __init__(self, table: Optional[TranspositionTable] = None, splitter=None, tracer=None, stats=None):
+        # Tablica transpozycji współdzielona przez wszystkie ruchy w partii (None - bez tablicy)
+        self.table = table
+        # parallel.RootSplitter - ruchy w korzeniu liczone równolegle (None - po kolei);
+        # table służy wtedy tylko pierwszemu ruchowi, procesy robocze mają własne tablice
+        self.splitter = splitter
+        # tree_export.TreeTracer - zapis drzewa przeszukiwania (ruchy to numery pól i * 3 + j)
+        self.tracer = tracer
+        # search_stats.SearchStats - węzły, cięcia i czas przeszukiwania (None - bez statystyk)
+        self.stats = stats
+
     def find_best_move(self, game: TicTacToeGame, ai_player: Player, max_depth: int) -> Tuple[int, int]:
         human_player = Player.O if ai_player == Player.X else Player.X
         best_score = -sys.maxsize
         best_move = (-1, -1)
 
+        # Przeszukiwanie w miejscu zakłada, że gra jeszcze trwa - zwycięzcę wykrywa po ostatnim ruchu
+        if game.is_game_over()[1] != Player.None_:
+            return self._find_best_move_cloning(game, ai_player, human_player, max_depth)
+
+        if self.splitter is not None:
+            return self.splitter.find_best_move(self, game, ai_player, max_depth)
+
+        tracer = self.tracer
+        if tracer is not None:
+            tracer.enter(None)
+        board = FlatBoard(game)
+        with measure(self.stats, max_depth):
+            if self.stats is not None:
+                self.stats.node(0)
+            for move in game.get_available_moves():
+                index = move[0] * board.size + move[1]
+                board.make(index, ai_player)
+                if tracer is not None:
+                    tracer.enter(index)
+                # Ruch nie lepszy od najlepszego dotąd nie zostanie wybrany, więc wystarczy okno (best_score, max)
+                score = self.search(board, index, 1, False, ai_player, human_player,
+                                    best_score, sys.maxsize, max_depth)
+                if tracer is not None:
+                    tracer.exit(score)
+                board.unmake(index)
+
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+
+        if tracer is not None:
+            tracer.exit(best_score)
+        return best_move
+
+    def _find_best_move_cloning(self, game: TicTacToeGame, ai_player: Player, human_player: Player,
+                                max_depth: int) -> Tuple[int, int]:
+        best_score = -sys.maxsize
+        best_move = (-1, -1)
+
         for move in game.get_available_moves():
             new_game = game.clone()
             new_game.make_move(move[0], move[1], ai_player)
@@ -86,6 +223,81 @@ class MinMaxAI:
 
         return best_move
 
+    def search(self, board: FlatBoard, last_move: int, depth: int, is_maximizing: bool,
+               ai_player: Player, human_player: Player, alpha: int, beta: int, max_depth: int) -> int:
+        """minimax bez kopiowania planszy: ruch -> rekurencja -> cofnięcie ruchu.
+
+        Zwraca te same wartości co minimax; o końcu gry decyduje tylko ostatni ruch.
+        """
+        stats = self.stats
+        if stats is not None:
+            stats.node(depth)
+        last_player = human_player if is_maximizing else ai_player
+        if board.wins_at(last_move, last_player):
+            return 10 - depth if last_player is ai_player else depth - 10
+        if board.empty == 0:
+            return 0
+
+        if depth >= max_depth:
+            return self.evaluate_flat(board, ai_player, human_player)
+
+        table = self.table
+        if table is not None:
+            # Klucz bez głębokości od korzenia - pozycja z tą samą pozostałą głębokością pasuje
+            # też w kolejnych ruchach; wyniki w tablicy są liczone od węzła
+            full = max_depth - depth >= board.empty
+            key = (canonical(board.x, board.o), is_maximizing, ai_player, min(max_depth - depth, board.empty))
+            value = table.probe(key, _score_to_node(alpha, depth, full), _score_to_node(beta, depth, full))
+            if stats is not None:
+                stats.probe(value is not None)
+            if value is not None:
+                return _score_to_root(value, depth, full)
+            alpha_start, beta_start = alpha, beta
+
+        tracer = self.tracer
+        occupied = board.x | board.o
+        if is_maximizing:
+            best_score = -sys.maxsize
+            for index in range(board.size * board.size):
+                if occupied >> index & 1:
+                    continue
+                board.make(index, ai_player)
+                if tracer is not None:
+                    tracer.enter(index)
+                score = self.search(board, index, depth + 1, False, ai_player, human_player, alpha, beta, max_depth)
+                if tracer is not None:
+                    tracer.exit(score)
+                board.unmake(index)
+                best_score = max(best_score, score)
+                alpha = max(alpha, best_score)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(depth)
+                    break
+        else:
+            best_score = sys.maxsize
+            for index in range(board.size * board.size):
+                if occupied >> index & 1:
+                    continue
+                board.make(index, human_player)
+                if tracer is not None:
+                    tracer.enter(index)
+                score = self.search(board, index, depth + 1, True, ai_player, human_player, alpha, beta, max_depth)
+                if tracer is not None:
+                    tracer.exit(score)
+                board.unmake(index)
+                best_score = min(best_score, score)
+                beta = min(beta, best_score)
+                if beta <= alpha:
+                    if stats is not None:
+                        stats.cutoff(depth)
+                    break
+
+        if table is not None:
+            table.store(key, _score_to_node(best_score, depth, full),
+                        _score_to_node(alpha_start, depth, full), _score_to_node(beta_start, depth, full))
+        return best_score
+
     def minimax(self, game: TicTacToeGame, depth: int, is_maximizing: bool,
                 ai_player: Player, human_player: Player, alpha: int, beta: int, max_depth: int) -> int:
         game_over, winner = game.is_game_over()
@@ -100,9 +312,20 @@ class MinMaxAI:
         if depth >= max_depth:
             return self.evaluate_board(game, ai_player, human_player)
 
+        moves = game.get_available_moves()
+        table = self.table
+        if table is not None:
+            # Jak w search: klucz bez głębokości od korzenia, wyniki w tablicy liczone od węzła
+            full = max_depth - depth >= len(moves)
+            key = (canonical(*game.bits()), is_maximizing, ai_player, min(max_depth - depth, len(moves)))
+            value = table.probe(key, _score_to_node(alpha, depth, full), _score_to_node(beta, depth, full))
+            if value is not None:
+                return _score_to_root(value, depth, full)
+            alpha_start, beta_start = alpha, beta
+
         if is_maximizing:
             best_score = -sys.maxsize
-            for move in game.get_available_moves():
+            for move in moves:
                 new_game = game.clone()
                 new_game.make_move(move[0], move[1], ai_player)
                 score = self.minimax(new_game, depth + 1, False, ai_player, human_player, alpha, beta, max_depth)
@@ -110,10 +333,9 @@ class MinMaxAI:
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break
-            return best_score
         else:
             best_score = sys.maxsize
-            for move in game.get_available_moves():
+            for move in moves:
                 new_game = game.clone()
                 new_game.make_move(move[0], move[1], human_player)
                 score = self.minimax(new_game, depth + 1, True, ai_player, human_player, alpha, beta, max_depth)
@@ -121,7 +343,15 @@ class MinMaxAI:
                 beta = min(beta, best_score)
                 if beta <= alpha:
                     break
-            return best_score
+
+        if table is not None:
+            table.store(key, _score_to_node(best_score, depth, full),
+                        _score_to_node(alpha_start, depth, full), _score_to_node(beta_start, depth, full))
+        return best_score
+
+    def evaluate_flat(self, board: FlatBoard, ai_player: Player, human_player: Player) -> int:
+        """evaluate_board dla FlatBoard - różnica liczby pól gracza AI i człowieka"""
+        return bin(board.stones(ai_player)).count('1') - bin(board.stones(human_player)).count('1')
 
     def evaluate_board(self, game: TicTacToeGame, ai_player: Player, human_player: Player) -> int:
         score = 0
@@ -136,7 +366,7 @@ class MinMaxAI:
 
 def main():
     game = TicTacToeGame()
-    ai = MinMaxAI()
+    ai = MinMaxAI(TranspositionTable())
     current_player = Player.X
 
     max_depth = int(input("Podaj maksymalną głębokość przeszukiwania dla AI (np. 2): "))
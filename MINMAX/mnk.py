@@ -0,0 +1,366 @@
+import sys
+import time
+from typing import List, Tuple
+
+from main2 import MinMaxAI, Player, TicTacToeGame
+from search_stats import measure
+
+# Wygrana jest warta WIN_SCORE - głębokość, więcej niż jakakolwiek ocena heurystyczna
+WIN_SCORE = 10 ** 12
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class MNKGame(TicTacToeGame):
+    """Gra m,n,k na planszy size x size: wygrywa k własnych pól w linii (wiersz, kolumna, przekątna)"""
+
+    def __init__(self, size: int = 15, k: int = 5):
+        if not 1 <= k <= size:
+            raise ValueError("k must be between 1 and the board size")
+        self.board_size = size
+        self.k = k
+        self.board = [[Player.None_ for _ in range(size)] for _ in range(size)]
+
+    def is_game_over(self) -> Tuple[bool, Player]:
+        n, k = self.board_size, self.k
+        for i in range(n):
+            for j in range(n):
+                player = self.board[i][j]
+                if player == Player.None_:
+                    continue
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                    if not (0 <= end_i < n and 0 <= end_j < n):
+                        continue
+                    if all(self.board[i + s * di][j + s * dj] == player for s in range(1, k)):
+                        return (True, player)
+
+        for row in self.board:
+            if Player.None_ in row:
+                return (False, Player.None_)
+        return (True, Player.None_)
+
+    def clone(self) -> 'MNKGame':
+        new_game = MNKGame(self.board_size, self.k)
+        new_game.board = [row.copy() for row in self.board]
+        return new_game
+
+
+def _windows(size: int, k: int) -> Tuple[List[int], List[Tuple[int, ...]]]:
+    """Wszystkie odcinki k pól w linii jako maski bitowe i, dla każdego pola, numery odcinków przez nie"""
+    windows = []
+    cell_windows = [[] for _ in range(size * size)]
+    for i in range(size):
+        for j in range(size):
+            for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_i, end_j = i + (k - 1) * di, j + (k - 1) * dj
+                if not (0 <= end_i < size and 0 <= end_j < size):
+                    continue
+                cells = [(i + s * di) * size + j + s * dj for s in range(k)]
+                for cell in cells:
+                    cell_windows[cell].append(len(windows))
+                windows.append(sum(1 << cell for cell in cells))
+    return windows, [tuple(w) for w in cell_windows]
+
+
+class MNKBoard:
+    """Plansza do przeszukiwania z oceną aktualizowaną przy każdym ruchu.
+
+    Dla każdego odcinka k pól trzymamy liczbę pól X i O. Odcinek zajęty tylko przez
+    jednego gracza to zagrożenie tym większe, im więcej ma pól - ruch zmienia tylko
+    odcinki przez swoje pole, więc ocena i wykrycie wygranej kosztują O(k) odcinków.
+    """
+    __slots__ = ('size', 'k', 'x', 'o', 'empty', 'cell_windows', 'x_counts', 'o_counts', 'score',
+                 'contribution', 'not_first_col', 'not_last_col', 'full')
+
+    _cache = {}
+
+    def __init__(self, game: MNKGame):
+        self.size = size = game.board_size
+        self.k = k = game.k
+        if (size, k) not in MNKBoard._cache:
+            MNKBoard._cache[(size, k)] = _windows(size, k)
+        windows, self.cell_windows = MNKBoard._cache[(size, k)]
+
+        # Wkład odcinka w ocenę z punktu widzenia X: contribution[pola X][pola O]
+        weights = [0] + [10 ** min(c - 1, 6) for c in range(1, k)] + [0]
+        self.contribution = [[weights[cx] if co == 0 else (-weights[co] if cx == 0 else 0)
+                              for co in range(k + 1)] for cx in range(k + 1)]
+
+        self.full = (1 << size * size) - 1
+        first_col = sum(1 << (i * size) for i in range(size))
+        self.not_first_col = self.full & ~first_col
+        self.not_last_col = self.full & ~(first_col << (size - 1))
+
+        self.x = self.o = 0
+        self.empty = size * size
+        self.x_counts = [0] * len(windows)
+        self.o_counts = [0] * len(windows)
+        self.score = 0
+        for i in range(size):
+            for j in range(size):
+                if game.board[i][j] != Player.None_:
+                    self.make(i * size + j, game.board[i][j])
+
+    def make(self, index: int, player: Player) -> bool:
+        """Stawia pole gracza - zwraca True, jeśli ten ruch wygrał"""
+        won = False
+        contribution = self.contribution
+        if player is Player.X:
+            self.x |= 1 << index
+            counts, other = self.x_counts, self.o_counts
+            for w in self.cell_windows[index]:
+                c, co = counts[w], other[w]
+                self.score += contribution[c + 1][co] - contribution[c][co]
+                counts[w] = c + 1
+                if c + 1 == self.k:
+                    won = True
+        else:
+            self.o |= 1 << index
+            counts, other = self.o_counts, self.x_counts
+            for w in self.cell_windows[index]:
+                c, cx = counts[w], other[w]
+                self.score += contribution[cx][c + 1] - contribution[cx][c]
+                counts[w] = c + 1
+                if c + 1 == self.k:
+                    won = True
+        self.empty -= 1
+        return won
+
+    def unmake(self, index: int, player: Player) -> None:
+        contribution = self.contribution
+        if player is Player.X:
+            self.x &= ~(1 << index)
+            counts, other = self.x_counts, self.o_counts
+            for w in self.cell_windows[index]:
+                c, co = counts[w], other[w]
+                self.score += contribution[c - 1][co] - contribution[c][co]
+                counts[w] = c - 1
+        else:
+            self.o &= ~(1 << index)
+            counts, other = self.o_counts, self.x_counts
+            for w in self.cell_windows[index]:
+                c, cx = counts[w], other[w]
+                self.score += contribution[cx][c - 1] - contribution[cx][c]
+                counts[w] = c - 1
+        self.empty += 1
+
+    def candidates(self, radius: int) -> int:
+        """Maska wolnych pól w odległości najwyżej radius od zajętych"""
+        occupied = self.x | self.o
+        near = occupied
+        for _ in range(radius):
+            near |= ((near << 1) & self.not_first_col) | ((near >> 1) & self.not_last_col)
+            near |= (near << self.size) | (near >> self.size)
+            near &= self.full
+        return near & ~occupied
+
+
+class MNKAI(MinMaxAI):
+    """MinMaxAI dla gier m,n,k: iteracyjne pogłębianie z limitem czasu na ruch.
+
+    Ruchy ograniczone są do pól w pobliżu zajętych i porządkowane: najpierw najlepszy ruch
+    z poprzedniej iteracji, potem ruchy-zabójcy z tej samej głębokości, potem według historii
+    cięć. Po przekroczeniu time_limit zwracany jest wynik ostatniej ukończonej iteracji.
+    Ze splitterem (parallel.RootSplitter) ruchy w korzeniu każdej iteracji liczone są
+    równolegle; statystyki (stats) zbierane są wtedy tylko bez splittera.
+    """
+
+    def __init__(self, time_limit: float = 1.0, radius: int = 1, stats=None, splitter=None):
+        if radius < 1:
+            raise ValueError("radius must be at least 1")
+        super().__init__(splitter=splitter, stats=stats)
+        self.time_limit = time_limit
+        self.radius = radius
+        self.nodes = 0
+        self.completed_depth = 0
+        self.best_score = None
+        self.deadline = None
+        self.killers = []
+        self.history = []
+        self.best_moves = {}
+        # W procesie roboczym splittera: poll() zwraca aktualne ograniczenie alfa z korzenia,
+        # odczytywane co 1024 węzły do root_bound i podnoszące alfę w każdym węźle poddrzewa
+        self.poll = None
+        self.root_bound = -sys.maxsize
+
+    def find_best_move(self, game: MNKGame, ai_player: Player, max_depth: int) -> Tuple[int, int]:
+        human_player = Player.O if ai_player == Player.X else Player.X
+        board = MNKBoard(game)
+        size = board.size
+        if board.empty == size * size:
+            return (size // 2, size // 2)
+        if board.empty == 0:
+            return (-1, -1)
+
+        self.nodes = 0
+        self.completed_depth = 0
+        self.deadline = time.perf_counter() + self.time_limit
+        self.killers = [[None, None] for _ in range(max_depth + 1)]
+        self.history = [0] * (size * size)
+        self.best_moves = {}
+
+        self.best_score = None
+
+        best_index = self.ordered_moves(board, 0)[0]
+        stats = self.stats
+        if self.splitter is not None:
+            # Część drzewa liczą procesy robocze - statystyki byłyby niepełne
+            self.stats = None
+        try:
+            for depth in range(1, max_depth + 1):
+                try:
+                    if self.splitter is not None:
+                        score = self.splitter.mnk_root(self, game, board, ai_player, depth)
+                    else:
+                        # Każda iteracja to osobny wpis w stats.searches - czas na głębokość
+                        with measure(self.stats, depth):
+                            score = self.alphabeta(board, 0, True, ai_player, human_player,
+                                                   -sys.maxsize, sys.maxsize, depth)
+                except SearchTimeout:
+                    break
+                best_index = self.best_moves[(board.x, board.o)]
+                self.best_score = score
+                self.completed_depth = depth
+                # Wygrana albo przegrana znaleziona - głębiej nic się nie zmieni
+                if abs(score) > WIN_SCORE - max_depth - 1:
+                    break
+        finally:
+            self.stats = stats
+
+        return divmod(best_index, size)
+
+    def search_root_move(self, board: MNKBoard, index: int, ai_player: Player, human_player: Player,
+                         alpha: int, max_depth: int) -> int:
+        """Wynik jednego ruchu w korzeniu przy oknie (alpha, max) - jak jeden obieg pętli alphabeta na głębokości 0"""
+        won = board.make(index, ai_player)
+        try:
+            if won:
+                return WIN_SCORE - 1
+            if board.empty == 0:
+                return 0
+            return self.alphabeta(board, 1, False, ai_player, human_player, alpha, sys.maxsize, max_depth)
+        finally:
+            board.unmake(index, ai_player)
+
+    def ordered_moves(self, board: MNKBoard, depth: int) -> List[int]:
+        candidates = board.candidates(self.radius)
+        if not candidates:
+            # Na pustej planszy nie ma pól w pobliżu zajętych - wtedy każde wolne pole
+            candidates = board.full & ~(board.x | board.o)
+        moves = []
+        while candidates:
+            low = candidates & -candidates
+            moves.append(low.bit_length() - 1)
+            candidates ^= low
+
+        history = self.history
+        moves.sort(key=lambda index: history[index], reverse=True)
+        first = [self.best_moves.get((board.x, board.o))]
+        if depth < len(self.killers):
+            first += self.killers[depth]
+        for index in reversed(first):
+            if index is not None and index in moves:
+                moves.remove(index)
+                moves.insert(0, index)
+        return moves
+
+    def alphabeta(self, board: MNKBoard, depth: int, is_maximizing: bool, ai_player: Player,
+                  human_player: Player, alpha: int, beta: int, max_depth: int) -> int:
+        self.nodes += 1
+        stats = self.stats
+        if stats is not None:
+            stats.node(depth)
+        if self.nodes & 1023 == 0:
+            if time.perf_counter() > self.deadline:
+                raise SearchTimeout()
+            if self.poll is not None:
+                self.root_bound = self.poll()
+        if self.root_bound > alpha:
+            alpha = self.root_bound
+
+        if depth >= max_depth:
+            return self.evaluate_threats(board, ai_player)
+
+        player = ai_player if is_maximizing else human_player
+        best_score = -sys.maxsize if is_maximizing else sys.maxsize
+        best_index = None
+        for index in self.ordered_moves(board, depth):
+            if board.make(index, player):
+                score = WIN_SCORE - (depth + 1) if is_maximizing else (depth + 1) - WIN_SCORE
+            elif board.empty == 0:
+                score = 0
+            else:
+                score = self.alphabeta(board, depth + 1, not is_maximizing, ai_player, human_player,
+                                       alpha, beta, max_depth)
+            board.unmake(index, player)
+
+            if (score > best_score) if is_maximizing else (score < best_score):
+                best_score = score
+                best_index = index
+            if is_maximizing:
+                alpha = max(alpha, best_score)
+            else:
+                beta = min(beta, best_score)
+            if self.root_bound > alpha:
+                alpha = self.root_bound
+            if beta <= alpha:
+                if stats is not None:
+                    stats.cutoff(depth)
+                killers = self.killers[depth]
+                if killers[0] != index:
+                    killers[0], killers[1] = index, killers[0]
+                # max_depth to głębokość bieżącej iteracji; kwadrat pozostałej głębokości zamiast
+                # 2 ** pozostała głębokość, żeby historia nie rosła do ogromnych liczb całkowitych
+                depth_left = max_depth - depth
+                self.history[index] += depth_left * depth_left
+                break
+
+        if best_index is None:
+            return 0
+        self.best_moves[(board.x, board.o)] = best_index
+        return best_score
+
+    def evaluate_threats(self, board: MNKBoard, ai_player: Player) -> int:
+        """Suma zagrożeń: odcinki k pól zajęte tylko przez jednego gracza, ważone liczbą jego pól"""
+        return board.score if ai_player is Player.X else -board.score
+
+
+def main():
+    size = int(input("Rozmiar planszy (np. 15): "))
+    k = int(input("Ile pól w linii wygrywa (np. 5): "))
+    time_limit = float(input("Limit czasu AI na ruch w sekundach (np. 2): "))
+    game = MNKGame(size, k)
+    ai = MNKAI(time_limit)
+    current_player = Player.X
+
+    while True:
+        game_over, winner = game.is_game_over()
+        if game_over:
+            break
+
+        game.print_board()
+
+        if current_player == Player.X:
+            print(f"Player X turn (row and column, 0-{size - 1}):")
+            row, col = map(int, input().split())
+            game.make_move(row, col, Player.X)
+        else:
+            best_move = ai.find_best_move(game, Player.O, size * size)
+            game.make_move(best_move[0], best_move[1], Player.O)
+            print(f"AI chose: {best_move[0]}, {best_move[1]} (depth {ai.completed_depth}, {ai.nodes} nodes)")
+
+        current_player = Player.O if current_player == Player.X else Player.X
+
+    game.print_board()
+    game_over, winner = game.is_game_over()
+    if winner != Player.None_:
+        print(f"{winner.value} wins!")
+    else:
+        print("It's a draw!")
+
+
+if __name__ == "__main__":
+    main()
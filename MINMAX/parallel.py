@@ -0,0 +1,223 @@
+import math
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bitboard
+from main2 import FlatBoard, MinMaxAI, Player
+from mnk import MNKAI, MNKBoard, SearchTimeout
+from transposition import TranspositionTable
+
+# Stan procesu roboczego: najlepszy dotąd wynik w korzeniu [wynik, numer ruchu] i własna tablica transpozycji
+_bound = None
+_table = None
+# MNKAI procesu roboczego i numer ruchu, którego dotyczy - ruchy-zabójcy i historia
+# zostają między iteracjami pogłębiania tego samego ruchu
+_mnk = None
+_mnk_search = None
+
+
+def _init_worker(bound):
+    global _bound, _table
+    _bound = bound
+    _table = TranspositionTable()
+
+
+def root_alpha(bound, order):
+    """Alfa dla ruchu o numerze order: ruch wcześniejszy od najlepszego musi jeszcze wykryć remis,
+    bo przy równych wynikach wygrywa pierwszy ruch"""
+    with bound.get_lock():
+        score, best_order = bound[0], bound[1]
+    return score - 1 if order < best_order else score
+
+
+def publish(bound, order, score):
+    """Zapisuje dokładny wynik ruchu, jeśli jest lepszy od dotychczasowego (albo równy i wcześniejszy)"""
+    with bound.get_lock():
+        if score > bound[0] or (score == bound[0] and order < bound[1]):
+            bound[0] = score
+            bound[1] = order
+
+
+def _bitboard_child(x, o, order, index, max_depth):
+    x |= 1 << index
+    alpha = root_alpha(_bound, order)
+    occupied = x | o
+    if bitboard.FIRST_WIN[x] != bitboard.FIRST_WIN[o] or occupied == bitboard.FULL or max_depth == 0:
+        score = bitboard.minimax(x, o, 0, max_depth, alpha, math.inf, False, _table)
+    else:
+        # Węzeł min pod korzeniem jak w bitboard.minimax, ale przed każdym wnukiem
+        # odczytujemy ograniczenie, które w międzyczasie mogły podnieść inne procesy
+        score = beta = math.inf
+        for i in range(9):
+            bit = 1 << i
+            if occupied & bit:
+                continue
+            alpha = max(alpha, root_alpha(_bound, order))
+            if beta <= alpha:
+                break
+            eval = bitboard.minimax(x, o | bit, 1, max_depth, alpha, beta, True, _table)
+            score = min(score, eval)
+            beta = min(beta, eval)
+    if score > root_alpha(_bound, order):
+        publish(_bound, order, score)
+    return order, score
+
+
+def _flat_child(game, order, move, ai_player, max_depth):
+    human_player = Player.O if ai_player == Player.X else Player.X
+    alpha = root_alpha(_bound, order)
+    ai = MinMaxAI(_table)
+    board = FlatBoard(game)
+    index = move[0] * board.size + move[1]
+    board.make(index, ai_player)
+    if board.wins_at(index, ai_player) or board.empty == 0 or max_depth <= 1:
+        score = ai.search(board, index, 1, False, ai_player, human_player, alpha, sys.maxsize, max_depth)
+    else:
+        # Jak _bitboard_child: ograniczenie odczytywane przed każdym wnukiem
+        score = beta = sys.maxsize
+        for i in range(board.size * board.size):
+            if (board.x | board.o) >> i & 1:
+                continue
+            alpha = max(alpha, root_alpha(_bound, order))
+            if beta <= alpha:
+                break
+            board.make(i, human_player)
+            eval = ai.search(board, i, 2, True, ai_player, human_player, alpha, beta, max_depth)
+            board.unmake(i)
+            score = min(score, eval)
+            beta = min(beta, eval)
+    if score > root_alpha(_bound, order):
+        publish(_bound, order, score)
+    return order, score
+
+
+def _mnk_child(search, game, radius, order, index, ai_player, max_depth, remaining):
+    """Jeden ruch w korzeniu iteracji MNKAI - zwraca (numer ruchu, wynik albo None po przekroczeniu czasu, węzły)"""
+    global _mnk, _mnk_search
+    if search != _mnk_search:
+        _mnk = MNKAI(radius=radius)
+        _mnk.history = [0] * (game.board_size * game.board_size)
+        _mnk_search = search
+    ai = _mnk
+    ai.killers += [[None, None] for _ in range(max_depth + 1 - len(ai.killers))]
+    ai.nodes = 0
+    ai.deadline = time.perf_counter() + remaining
+    ai.poll = lambda: root_alpha(_bound, order)
+    ai.root_bound = ai.poll()
+
+    human_player = Player.O if ai_player == Player.X else Player.X
+    try:
+        score = ai.search_root_move(MNKBoard(game), index, ai_player, human_player, ai.root_bound, max_depth)
+    except SearchTimeout:
+        return order, None, ai.nodes
+    if score > root_alpha(_bound, order):
+        publish(_bound, order, score)
+    return order, score, ai.nodes
+
+
+def _pick(results):
+    """Pierwszy ruch z najwyższym wynikiem - tak samo jak przy przeszukiwaniu po kolei"""
+    best_score, best_order = max((score, -order) for order, score in results)
+    return -best_order
+
+
+class RootSplitter:
+    """Równoległe przeszukiwanie korzenia w stylu Young Brothers Wait.
+
+    Pierwszy ruch (najstarszy brat) liczony jest od razu, żeby ustalić ograniczenie alfa;
+    pozostałe ruchy liczą procesy robocze. Najlepszy dotąd wynik leży w pamięci współdzielonej;
+    każde poddrzewo startuje od aktualnego ograniczenia i odczytuje je ponownie w trakcie
+    przeszukiwania (w kółku i krzyżyku przed każdym wnukiem, w MNKAI co 1024 węzły).
+    Wybrany ruch ma taką samą ocenę jak przy przeszukiwaniu szeregowym. Pula procesów
+    zostaje między ruchami - zamknij ją close().
+    """
+
+    def __init__(self, workers=None):
+        self.bound = multiprocessing.Array('d', [-math.inf, math.inf])
+        self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.bound,))
+        # Numer przeszukiwania MNKAI - nowy przy pierwszej iteracji każdego ruchu
+        self.search = 0
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _reset(self, score, order):
+        with self.bound.get_lock():
+            self.bound[0] = score
+            self.bound[1] = order
+
+    def best_move_bits(self, x, o, max_depth):
+        """To samo co bitboard.best_move(x, o, max_depth)"""
+        occupied = x | o
+        moves = [i for i in range(9) if not occupied >> i & 1]
+        if not moves:
+            return None
+
+        first = bitboard.minimax(x | 1 << moves[0], o, 0, max_depth, -math.inf, math.inf, False)
+        self._reset(first, 0)
+        futures = [self.pool.submit(_bitboard_child, x, o, order, index, max_depth)
+                   for order, index in enumerate(moves) if order > 0]
+        results = [(0, first)] + [future.result() for future in futures]
+        return moves[_pick(results)]
+
+    def find_best_move(self, ai, game, ai_player, max_depth):
+        """To samo co ai.find_best_move(game, ai_player, max_depth) dla trwającej gry"""
+        moves = game.get_available_moves()
+        if not moves:
+            return (-1, -1)
+
+        human_player = Player.O if ai_player == Player.X else Player.X
+        board = FlatBoard(game)
+        index = moves[0][0] * board.size + moves[0][1]
+        board.make(index, ai_player)
+        # Bez ai.tracer i ai.stats - reszta drzewa powstaje w procesach roboczych, więc zapis
+        # i statystyki byłyby niepełne
+        searcher = MinMaxAI(ai.table)
+        first = searcher.search(board, index, 1, False, ai_player, human_player, -sys.maxsize, sys.maxsize, max_depth)
+
+        self._reset(first, 0)
+        futures = [self.pool.submit(_flat_child, game, order, move, ai_player, max_depth)
+                   for order, move in enumerate(moves) if order > 0]
+        results = [(0, first)] + [future.result() for future in futures]
+        return moves[_pick(results)]
+
+    def mnk_root(self, ai, game, board, ai_player, max_depth):
+        """Jedna iteracja pogłębiania MNKAI.find_best_move do głębokości max_depth - zwraca ocenę korzenia.
+
+        Najlepszy ruch poprzedniej iteracji jest pierwszy w kolejności, więc to on ustala alfę.
+        Po przekroczeniu czasu rzuca SearchTimeout, jak alphabeta.
+        """
+        if max_depth == 1:
+            self.search += 1
+        human_player = Player.O if ai_player == Player.X else Player.X
+        moves = ai.ordered_moves(board, 0)
+        first = ai.search_root_move(board, moves[0], ai_player, human_player, -sys.maxsize, max_depth)
+
+        self._reset(first, 0)
+        remaining = ai.deadline - time.perf_counter()
+        futures = [self.pool.submit(_mnk_child, self.search, game, ai.radius, order, index, ai_player, max_depth,
+                                    remaining)
+                   for order, index in enumerate(moves) if order > 0]
+        results = [(0, first)]
+        timed_out = False
+        for future in futures:
+            order, score, nodes = future.result()
+            ai.nodes += nodes
+            if score is None:
+                timed_out = True
+            else:
+                results.append((order, score))
+        if timed_out:
+            raise SearchTimeout()
+
+        best = _pick(results)
+        ai.best_moves[(board.x, board.o)] = moves[best]
+        return max(score for order, score in results)
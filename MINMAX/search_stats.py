@@ -0,0 +1,121 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+
+class SearchStats:
+    """Statystyki przeszukiwania wspólne dla minimax (bitboard.py), MinMaxAI (main2.py) i A* (AGwiazdka).
+
+    Przeszukiwanie dostaje obiekt przez parametr stats i woła node(głębokość) dla każdego
+    odwiedzonego węzła, cutoff(głębokość) przy cięciu alfa-beta, probe(trafienie) przy
+    zajrzeniu do tablicy transpozycji i frontier(open, closed) w A*. Głębokość to liczba
+    ruchów od korzenia (korzeń ma 0). Bez obiektu (stats=None) koszt to jedno porównanie.
+    track_memory=True mierzy szczytowe zużycie pamięci przez tracemalloc (wolniej).
+    """
+
+    def __init__(self, track_memory=False):
+        self.track_memory = track_memory
+        self.nodes = 0
+        self.cutoffs = 0
+        self.tt_probes = 0
+        self.tt_hits = 0
+        self.max_open = 0
+        self.max_closed = 0
+        self.peak_memory = 0
+        # Liczniki dla kolejnych głębokości
+        self.depth_nodes = []
+        self.depth_cutoffs = []
+        # Kolejne przeszukiwania (ruchy albo iteracje pogłębiania): głębokość, czas, węzły
+        self.searches = []
+
+    def node(self, depth):
+        self.nodes += 1
+        if depth >= len(self.depth_nodes):
+            self._grow(depth)
+        self.depth_nodes[depth] += 1
+
+    def cutoff(self, depth):
+        self.cutoffs += 1
+        if depth >= len(self.depth_cutoffs):
+            self._grow(depth)
+        self.depth_cutoffs[depth] += 1
+
+    def _grow(self, depth):
+        missing = depth + 1 - len(self.depth_nodes)
+        self.depth_nodes += [0] * missing
+        self.depth_cutoffs += [0] * missing
+
+    def probe(self, hit):
+        self.tt_probes += 1
+        if hit:
+            self.tt_hits += 1
+
+    def frontier(self, open_size, closed_size):
+        if open_size > self.max_open:
+            self.max_open = open_size
+        if closed_size > self.max_closed:
+            self.max_closed = closed_size
+
+    def branching_factors(self):
+        """Efektywny współczynnik rozgałęzienia: węzły na głębokości d + 1 na węzeł z głębokości d"""
+        return [below / nodes if nodes else 0.0 for nodes, below in zip(self.depth_nodes, self.depth_nodes[1:])]
+
+    @contextmanager
+    def search(self, max_depth):
+        """Mierzy jedno przeszukiwanie do głębokości max_depth - czas, węzły, cięcia i pamięć"""
+        started_tracing = self.track_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        elif self.track_memory:
+            tracemalloc.reset_peak()
+        nodes, cutoffs = self.nodes, self.cutoffs
+        completed = False
+        start = time.perf_counter()
+        try:
+            yield self
+            completed = True
+        finally:
+            record = {
+                'max_depth': max_depth,
+                'seconds': time.perf_counter() - start,
+                'nodes': self.nodes - nodes,
+                'cutoffs': self.cutoffs - cutoffs,
+                # False, gdy przeszukiwanie przerwał wyjątek (np. koniec czasu w MNKAI)
+                'completed': completed,
+            }
+            if self.track_memory:
+                record['peak_memory'] = tracemalloc.get_traced_memory()[1]
+                self.peak_memory = max(self.peak_memory, record['peak_memory'])
+                if started_tracing:
+                    tracemalloc.stop()
+            self.searches.append(record)
+
+    def to_dict(self):
+        factors = self.branching_factors()
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'tt_probes': self.tt_probes,
+            'tt_hits': self.tt_hits,
+            'max_open': self.max_open,
+            'max_closed': self.max_closed,
+            'peak_memory': self.peak_memory if self.track_memory else None,
+            'depths': [{'depth': depth, 'nodes': nodes, 'cutoffs': cutoffs,
+                        'branching_factor': factors[depth] if depth < len(factors) else None}
+                       for depth, (nodes, cutoffs) in enumerate(zip(self.depth_nodes, self.depth_cutoffs))],
+            'searches': self.searches,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def write_json(self, path):
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(self.to_json())
+            file.write("\n")
+
+
+def measure(stats, max_depth):
+    """stats.search(max_depth), a bez statystyk (stats=None) pusty kontekst"""
+    return nullcontext() if stats is None else stats.search(max_depth)
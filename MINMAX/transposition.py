@@ -0,0 +1,81 @@
+EXACT = 0
+LOWER = 1
+UPPER = 2
+
+
+def _transforms():
+    """8 symetrii planszy 3x3 jako permutacje pól: transform[i] - gdzie trafia pole i"""
+    def rotate(cell):
+        row, col = divmod(cell, 3)
+        return col * 3 + (2 - row)
+
+    def reflect(cell):
+        row, col = divmod(cell, 3)
+        return row * 3 + (2 - col)
+
+    result = []
+    for reflected in (False, True):
+        for turns in range(4):
+            permutation = []
+            for cell in range(9):
+                target = reflect(cell) if reflected else cell
+                for _ in range(turns):
+                    target = rotate(target)
+                permutation.append(target)
+            result.append(permutation)
+    return result
+
+
+TRANSFORMS = _transforms()
+# TRANSFORM_TABLES[t][pola] - maska pól po zastosowaniu symetrii t
+TRANSFORM_TABLES = [[sum(1 << perm[i] for i in range(9) if stones >> i & 1) for stones in range(1 << 9)]
+                    for perm in TRANSFORMS]
+
+
+def canonical(x, o):
+    """Ten sam klucz dla pozycji i wszystkich jej obrotów i odbić: najmniejsze (x << 9 | o)"""
+    return min((table[x] << 9) | table[o] for table in TRANSFORM_TABLES)
+
+
+class TranspositionTable:
+    """Ocenione pozycje: klucz -> (wartość, rodzaj ograniczenia).
+
+    Wynik alfa-beta jest dokładny tylko wewnątrz okna; poza nim zapisujemy go jako
+    ograniczenie dolne (wartość >= beta) albo górne (wartość <= alpha). Tablica nie
+    jest czyszczona między ruchami, więc kolejne przeszukiwania w partii korzystają
+    z poprzednich.
+    """
+
+    def __init__(self):
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def probe(self, key, alpha, beta):
+        """Wartość z tablicy, jeśli rozstrzyga węzeł dla okna (alpha, beta), inaczej None"""
+        entry = self.entries.get(key)
+        if entry is not None:
+            value, bound = entry
+            if bound == EXACT or (bound == LOWER and value >= beta) or (bound == UPPER and value <= alpha):
+                self.hits += 1
+                return value
+        self.misses += 1
+        return None
+
+    def store(self, key, value, alpha, beta):
+        """Zapisuje wynik przeszukania węzła z oknem (alpha, beta)"""
+        if value <= alpha:
+            bound = UPPER
+        elif value >= beta:
+            bound = LOWER
+        else:
+            bound = EXACT
+        self.entries[key] = (value, bound)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
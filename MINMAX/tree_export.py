@@ -0,0 +1,208 @@
+import argparse
+import os
+import re
+import struct
+from abc import ABC, abstractmethod
+
+_ID = re.compile(r'[a-zA-Z_\u0080-\U0010ffff][a-zA-Z0-9_\u0080-\U0010ffff]*|-?(\.[0-9]+|[0-9]+(\.[0-9]*)?)')
+_KEYWORDS = {'node', 'edge', 'graph', 'digraph', 'subgraph', 'strict'}
+
+
+def quote(text):
+    """Identyfikator DOT - w cudzysłowie tylko wtedy, gdy jest to potrzebne (jak biblioteka graphviz)"""
+    text = str(text)
+    if _ID.fullmatch(text) and text.lower() not in _KEYWORDS:
+        return text
+    return '"' + text.replace('"', '\\"') + '"'
+
+
+def _attributes(label=None, attrs=None):
+    items = [] if label is None else [f"label={quote(label)}"]
+    items += [f"{key}={quote(value)}" for key, value in sorted((attrs or {}).items())]
+    return f" [{' '.join(items)}]" if items else ""
+
+
+class DotWriter:
+    """Strumieniowy zapis grafu DOT - każdy węzeł i krawędź trafia od razu do pliku"""
+
+    def __init__(self, file, comment=None, node_attrs=None):
+        self.file = file
+        if comment is not None:
+            file.write(f"// {comment}\n")
+        file.write("digraph {\n")
+        if node_attrs:
+            file.write(f"\tnode{_attributes(attrs=node_attrs)}\n")
+
+    def node(self, node_id, label=None, **attrs):
+        self.file.write(f"\t{quote(node_id)}{_attributes(label, attrs)}\n")
+
+    def edge(self, tail, head):
+        self.file.write(f"\t{quote(tail)} -> {quote(head)}\n")
+
+    def close(self):
+        self.file.write("}\n")
+
+
+class TreeTracer(ABC):
+    """Zapis drzewa przeszukiwania w trakcie przeszukiwania, bez trzymania drzewa w pamięci.
+
+    Przeszukiwanie woła enter(ruch) przed zejściem do dziecka i exit(wartość) po powrocie.
+    Węzeł jest zapisywany przy wyjściu, gdy znana jest już jego wartość; w pamięci jest
+    tylko ścieżka od korzenia. Węzły głębsze niż max_depth i ponad max_nodes są pomijane
+    (przeszukiwanie idzie dalej, liczy je tylko `skipped`).
+    """
+
+    def __init__(self, max_depth=None, max_nodes=None):
+        self.max_depth = max_depth
+        self.max_nodes = max_nodes
+        self.nodes = 0
+        self.skipped = 0
+        # Ścieżka od korzenia: (numer węzła albo None, gdy pominięty, ruch)
+        self.stack = []
+
+    def enter(self, move):
+        depth = len(self.stack)
+        parent_recorded = not self.stack or self.stack[-1][0] is not None
+        if (parent_recorded and (self.max_depth is None or depth <= self.max_depth)
+                and (self.max_nodes is None or self.nodes < self.max_nodes)):
+            node_id = self.nodes
+            self.nodes += 1
+        else:
+            node_id = None
+            self.skipped += 1
+        self.stack.append((node_id, move))
+
+    def exit(self, value):
+        node_id, move = self.stack.pop()
+        if node_id is not None:
+            parent_id = self.stack[-1][0] if self.stack else None
+            self.write(node_id, parent_id, len(self.stack), move, value)
+
+    @abstractmethod
+    def write(self, node_id, parent_id, depth, move, value):
+        """Zapisuje węzeł o znanej już wartości (rodzic None dla korzenia)"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DotTreeTracer(TreeTracer):
+    """Drzewo przeszukiwania jako plik DOT: etykieta to ruch i jego wartość"""
+
+    def __init__(self, path, comment="Drzewo przeszukiwania", max_depth=None, max_nodes=None):
+        super().__init__(max_depth, max_nodes)
+        self.file = open(path, 'w', encoding='utf-8')
+        self.dot = DotWriter(self.file, comment)
+
+    def write(self, node_id, parent_id, depth, move, value):
+        label = "root" if move is None else move
+        self.dot.node(f"n{node_id}", f"{label}\nwynik: {value}")
+        if parent_id is not None:
+            self.dot.edge(f"n{parent_id}", f"n{node_id}")
+
+    def close(self):
+        if not self.file.closed:
+            self.dot.close()
+            self.file.close()
+
+
+# Rekord dziennika: numer węzła, numer rodzica (NO_PARENT dla korzenia), głębokość, ruch (-1 w korzeniu), wartość
+NODE_RECORD = struct.Struct('<IIHhd')
+NO_PARENT = 0xFFFFFFFF
+
+
+class BinaryTreeTracer(TreeTracer):
+    """Drzewo przeszukiwania jako zwarty dziennik binarny - rekordy NODE_RECORD w kolejności wyjścia z węzłów"""
+
+    def __init__(self, path, max_depth=None, max_nodes=None):
+        super().__init__(max_depth, max_nodes)
+        self.file = open(path, 'wb')
+
+    def write(self, node_id, parent_id, depth, move, value):
+        self.file.write(NODE_RECORD.pack(node_id, NO_PARENT if parent_id is None else parent_id, depth,
+                                         -1 if move is None else move, value))
+
+    def close(self):
+        self.file.close()
+
+
+def read_node_log(path):
+    """Czyta dziennik BinaryTreeTracer - zwraca kolejne (węzeł, rodzic albo None, głębokość, ruch, wartość)"""
+    with open(path, 'rb') as file:
+        while True:
+            record = file.read(NODE_RECORD.size)
+            if len(record) < NODE_RECORD.size:
+                return
+            node_id, parent_id, depth, move, value = NODE_RECORD.unpack(record)
+            yield node_id, None if parent_id == NO_PARENT else parent_id, depth, move, value
+
+
+RPSLS_MOVES = ['rock', 'paper', 'scissors', 'lizard', 'spock']
+RPSLS_BEATS = {
+    'rock': ('scissors', 'lizard'),
+    'paper': ('rock', 'spock'),
+    'scissors': ('paper', 'lizard'),
+    'lizard': ('paper', 'spock'),
+    'spock': ('rock', 'scissors'),
+}
+RPSLS_NAMES = {'rock': 'Kamień', 'paper': 'Papier', 'scissors': 'Nożyce', 'lizard': 'Jaszczurka', 'spock': 'Spock'}
+RPSLS_CODES = {'rock': 'R', 'paper': 'P', 'scissors': 'S', 'lizard': 'L', 'spock': 'V'}
+RESULT_COLORS = {1: 'green', 0: 'yellow', -1: 'red'}
+
+
+def payoff_table(moves, beats):
+    """Tabela wypłat (mój ruch, ruch przeciwnika) -> 1, 0 albo -1"""
+    return {(mine, theirs): 1 if theirs in beats[mine] else -1 if mine in beats[theirs] else 0
+            for mine in moves for theirs in moves}
+
+
+def write_decision_tree(file, moves=RPSLS_MOVES, payoff=None):
+    """Drzewo decyzji RPSLS w formacie pliku decision_tree"""
+    payoff = payoff or payoff_table(moves, RPSLS_BEATS)
+    dot = DotWriter(file, "Min-Max Tree: Rock Paper Scissors Lizard Spock")
+    dot.node('root', "Twoja decyzja")
+    for mine in moves:
+        dot.node(f"my_{mine}", mine)
+        dot.edge('root', f"my_{mine}")
+        for theirs in moves:
+            dot.node(f"{mine}_vs_{theirs}", f"vs {theirs}\nwynik: {payoff[mine, theirs]}")
+            dot.edge(f"my_{mine}", f"{mine}_vs_{theirs}")
+    dot.close()
+
+
+def write_rpsls_tree(file, moves=RPSLS_MOVES, payoff=None, names=RPSLS_NAMES, codes=RPSLS_CODES):
+    """Drzewo gry RPSLS w formacie pliku rpsls_tree - liście kolorowane według wyniku"""
+    payoff = payoff or payoff_table(moves, RPSLS_BEATS)
+    dot = DotWriter(file, "Drzewo gry RPSLS", {'style': 'filled', 'fillcolor': 'lightblue', 'shape': 'box'})
+    dot.node('root', "Start gry")
+    for mine in moves:
+        dot.node(f"P_{codes[mine]}", f"Gracz: {names[mine]}")
+        dot.edge('root', f"P_{codes[mine]}")
+        for theirs in moves:
+            result = payoff[mine, theirs]
+            leaf = f"O_{codes[mine]}_{codes[theirs]}"
+            dot.node(leaf, f"Przeciwnik: {names[theirs]}\nWynik: {result}", fillcolor=RESULT_COLORS[result])
+            dot.edge(f"P_{codes[mine]}", leaf)
+    dot.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generuje drzewa RPSLS (decision_tree i rpsls_tree) w formacie DOT")
+    parser.add_argument('--out-dir', default=os.path.dirname(os.path.abspath(__file__)))
+    args = parser.parse_args()
+
+    for name, write in (('decision_tree', write_decision_tree), ('rpsls_tree', write_rpsls_tree)):
+        path = os.path.join(args.out_dir, name)
+        with open(path, 'w', encoding='utf-8', newline='\n') as file:
+            write(file)
+        print(f"Zapisano {path}")
+
+
+if __name__ == '__main__':
+    main()
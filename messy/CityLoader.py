@@ -0,0 +1,166 @@
+import json
+import os
+
+import numpy as np
+
+from Geometry import latlon_to_xyz_array
+
+CACHE_SUFFIX = '.cache'
+# Wersja 2: cache zbudowany przed sprawdzaniem kierunków i zakresów współrzędnych jest nieważny
+CACHE_VERSION = 2
+
+
+def parse_coordinate(coord_str):
+    direction = coord_str[-1:]
+    if direction not in ('N', 'S', 'E', 'W'):
+        raise ValueError(f"coordinate '{coord_str}' must end with N, S, E or W")
+    coord_str = coord_str.replace('°', '.').replace("'", '')
+    value = float(coord_str[:-1])
+
+    if direction in ['S', 'W']:
+        value = -value
+
+    return value
+
+
+def iter_cities(file, errors=None):
+    """Strumieniowo parsuje linie 'nazwa lon lat' - zwraca krotki (nazwa, lat, lon).
+
+    Błędne linie nie są wypisywane, tylko dopisywane do listy errors jako (numer linii, linia, błąd).
+    """
+    for line_no, line in enumerate(file, 1):
+        parts = line.strip().split()
+        if not parts:
+            continue
+
+        try:
+            if len(parts) < 3:
+                raise ValueError("expected '<name> <lon> <lat>'")
+            lon = parse_coordinate(parts[-2])
+            lat = parse_coordinate(parts[-1])
+            if not -180 <= lon <= 180:
+                raise ValueError(f"longitude {lon} out of range [-180, 180]")
+            if not -90 <= lat <= 90:
+                raise ValueError(f"latitude {lat} out of range [-90, 90]")
+        except ValueError as e:
+            if errors is not None:
+                errors.append((line_no, line.strip(), str(e)))
+            continue
+
+        yield ' '.join(parts[:-2]), lat, lon
+
+
+def report_errors(errors, limit=20):
+    """Wypisuje zebrane błędy parsowania jednym blokiem"""
+    if not errors:
+        return
+    print(f"Skipped {len(errors)} malformed line(s):")
+    for line_no, line, error in errors[:limit]:
+        print(f"  line {line_no}: {line!r} ({error})")
+    if len(errors) > limit:
+        print(f"  ... and {len(errors) - limit} more")
+
+
+class CityData:
+    """Miasta wczytane z pliku: nazwy, tablice lat/lon/xyz i indeks nazwa -> numer miasta.
+
+    cities[i] zwraca krotkę (nazwa, lat, lon), jak dotychczasowa lista miast.
+    """
+
+    def __init__(self, names, lat, lon, xyz):
+        self.names = names
+        self.lat = lat
+        self.lon = lon
+        self.xyz = xyz
+        # Pierwsze wystąpienie każdej nazwy; ostatnie tylko dla nazw powtórzonych
+        self.name_index = {}
+        self.last_index = {}
+        for i, name in enumerate(names):
+            if name in self.name_index:
+                self.last_index[name] = i
+            else:
+                self.name_index[name] = i
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, i):
+        return self.names[i], float(self.lat[i]), float(self.lon[i])
+
+    def index(self, name, last=False):
+        """Numer pierwszego (albo, przy last=True, ostatniego) miasta o danej nazwie albo None"""
+        if last and name in self.last_index:
+            return self.last_index[name]
+        return self.name_index.get(name)
+
+
+def _source_signature(path):
+    stat = os.stat(path)
+    return {'version': CACHE_VERSION, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_cache(cache_dir, signature):
+    try:
+        with open(os.path.join(cache_dir, 'meta.json'), 'r') as file:
+            if json.load(file) != signature:
+                return None
+        coords = np.load(os.path.join(cache_dir, 'coords.npy'), mmap_mode='r')
+        with open(os.path.join(cache_dir, 'names.txt'), 'r', encoding='utf-8') as file:
+            names = file.read().split('\n') if len(coords) else []
+    except (OSError, ValueError):
+        return None
+
+    if len(names) != len(coords):
+        return None
+    return CityData(names, coords[:, 0], coords[:, 1], coords[:, 2:5])
+
+
+def _write_cache(cache_dir, signature, cities):
+    os.makedirs(cache_dir, exist_ok=True)
+    # meta.json zapisywany na końcu - niedokończony cache nie przejdzie walidacji
+    meta_path = os.path.join(cache_dir, 'meta.json')
+    if os.path.exists(meta_path):
+        os.remove(meta_path)
+
+    coords = np.column_stack((cities.lat, cities.lon, cities.xyz)) if len(cities) else np.empty((0, 5))
+    np.save(os.path.join(cache_dir, 'coords.npy'), coords)
+    with open(os.path.join(cache_dir, 'names.txt'), 'w', encoding='utf-8') as file:
+        file.write('\n'.join(cities.names))
+    with open(meta_path, 'w') as file:
+        json.dump(signature, file)
+
+
+def load_cities(path, use_cache=True, error_limit=20):
+    """Wczytuje plik z miastami, korzystając z binarnego cache obok pliku, jeśli jest aktualny.
+
+    Cache (katalog <plik>.cache) zawiera lat/lon/xyz w pliku .npy otwieranym przez mmap
+    oraz listę nazw; jest unieważniany przy zmianie rozmiaru lub czasu modyfikacji pliku.
+    """
+    signature = _source_signature(path)
+    cache_dir = path + CACHE_SUFFIX
+
+    if use_cache:
+        cities = _read_cache(cache_dir, signature)
+        if cities is not None:
+            return cities
+
+    names, lats, lons = [], [], []
+    errors = []
+    with open(path, 'r', encoding='utf-8') as file:
+        for name, lat, lon in iter_cities(file, errors):
+            names.append(name)
+            lats.append(lat)
+            lons.append(lon)
+    report_errors(errors, error_limit)
+
+    lat = np.array(lats, dtype=np.float64)
+    lon = np.array(lons, dtype=np.float64)
+    cities = CityData(names, lat, lon, latlon_to_xyz_array(lat, lon))
+
+    if use_cache:
+        try:
+            _write_cache(cache_dir, signature, cities)
+        except OSError as e:
+            print(f"Could not write city cache {cache_dir}: {e}")
+
+    return cities
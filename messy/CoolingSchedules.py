@@ -0,0 +1,20 @@
+import importlib.util
+import os
+import sys
+
+# Harmonogramy schładzania są wspólne z minimum/main.py - ładujemy minimum/schedules.py
+# wprost z pliku, bez dopisywania katalogu minimum/ do sys.path. Moduł jest rejestrowany
+# w sys.modules, żeby harmonogramy dało się serializować (pickle) do procesów roboczych
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'minimum', 'schedules.py')
+_schedules = sys.modules.get('minimum_schedules')
+if _schedules is None:
+    _spec = importlib.util.spec_from_file_location('minimum_schedules', _PATH)
+    _schedules = importlib.util.module_from_spec(_spec)
+    sys.modules['minimum_schedules'] = _schedules
+    _spec.loader.exec_module(_schedules)
+
+CoolingSchedule = _schedules.CoolingSchedule
+GeometricSchedule = _schedules.GeometricSchedule
+TimeBudgetSchedule = _schedules.TimeBudgetSchedule
+ReheatingSchedule = _schedules.ReheatingSchedule
+AdaptiveSchedule = _schedules.AdaptiveSchedule
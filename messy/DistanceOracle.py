@@ -0,0 +1,94 @@
+from array import array
+from collections import OrderedDict
+from math import sqrt
+
+import numpy as np
+
+from Geometry import distance_row, distance_matrix
+
+# Powyżej tej liczby miast pełna macierz n x n nie jest budowana
+MATRIX_CITY_LIMIT = 20000
+
+
+class DistanceOracle:
+    """Liczy odległości na żądanie ze współrzędnych ECEF zamiast trzymać macierz n x n.
+
+    Obsługuje ten sam interfejs co macierz z Geometry: len(d), d[i] (cały wiersz)
+    oraz d[i, j] (pojedyncza odległość lub tablice indeksów). Ostatnio używane
+    wiersze trzymane są w ograniczonym cache LRU. hits liczy odczyty z cache (wierszy
+    i pojedynczych odległości), misses - wiersze liczone od nowa.
+    """
+
+    def __init__(self, xyz, cache_size=64, dtype=np.float64):
+        # Współrzędne raz, jako płaska tablica x0 y0 z0 x1 ... (szybki odczyt pojedynczych liczb);
+        # xyz to widok NumPy na tę samą pamięć
+        self.flat = array('d', np.asarray(xyz, dtype=np.float64).reshape(-1).tolist())
+        self.xyz = np.frombuffer(self.flat, dtype=np.float64).reshape(-1, 3)
+        self.cache_size = cache_size
+        self.dtype = np.dtype(dtype)
+        self.rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.xyz)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.row(key)
+
+        i, j = key
+        if np.ndim(i) == 0 and np.ndim(j) == 0:
+            return self.distance(i, j)
+
+        diff = self.xyz[np.asarray(i)] - self.xyz[np.asarray(j)]
+        return np.sqrt((diff * diff).sum(axis=-1)).astype(self.dtype, copy=False)
+
+    def distance(self, i, j):
+        """Odległość między dwoma miastami - z cache jeśli wiersz jest dostępny"""
+        rows = self.rows
+        row = rows.get(i)
+        if row is not None:
+            rows.move_to_end(i)
+            self.hits += 1
+            return row[j]
+        row = rows.get(j)
+        if row is not None:
+            rows.move_to_end(j)
+            self.hits += 1
+            return row[i]
+
+        flat = self.flat
+        a, b = 3 * i, 3 * j
+        dx = flat[a] - flat[b]
+        dy = flat[a + 1] - flat[b + 1]
+        dz = flat[a + 2] - flat[b + 2]
+        return self.dtype.type(sqrt(dx * dx + dy * dy + dz * dz))
+
+    def row(self, i):
+        """Odległości od miasta i do wszystkich miast (wiersz trafia do cache LRU)"""
+        row = self.rows.get(i)
+        if row is not None:
+            self.rows.move_to_end(i)
+            self.hits += 1
+            return row
+
+        self.misses += 1
+        row = distance_row(self.xyz, i).astype(self.dtype, copy=False)
+        if self.cache_size > 0:
+            self.rows[i] = row
+            if len(self.rows) > self.cache_size:
+                self.rows.popitem(last=False)
+        return row
+
+    def clear(self):
+        self.rows.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def distance_provider(xyz, dtype=np.float64, max_matrix_cities=MATRIX_CITY_LIMIT, cache_size=64):
+    """Pełna macierz dla małych instancji, DistanceOracle dla dużych"""
+    if len(xyz) > max_matrix_cities:
+        return DistanceOracle(xyz, cache_size=cache_size, dtype=dtype)
+    return distance_matrix(xyz, dtype=dtype)
@@ -0,0 +1,142 @@
+from math import sin, cos, sqrt, radians
+
+import numpy as np
+
+a = 6378.137
+b = 6356.752
+e2 = 1 - (b ** 2 / a ** 2)
+
+# Ile bajtów może zająć tymczasowa tablica różnic (blok, n, 3) przy budowie macierzy
+BLOCK_BYTES = 64 * 1024 * 1024
+
+
+def latlon_to_xyz(lat, lon, h=0):
+    lat_rad = radians(lat)
+    lon_rad = radians(lon)
+
+    N = a / sqrt(1 - e2 * sin(lat_rad) ** 2)
+
+    x = (N + h) * cos(lat_rad) * cos(lon_rad)
+    y = (N + h) * cos(lat_rad) * sin(lon_rad)
+    z = (b ** 2 / a ** 2 * N + h) * sin(lat_rad)
+
+    return x, y, z
+
+
+def euclidean_distance(coord1, coord2):
+    x1, y1, z1 = coord1
+    x2, y2, z2 = coord2
+
+    distance = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2)
+    return distance
+
+
+def latlon_to_xyz_array(lats, lons, h=0):
+    """Przelicza wszystkie współrzędne naraz - zwraca tablicę (n, 3) współrzędnych ECEF"""
+    lat_rad = np.radians(np.asarray(lats, dtype=np.float64))
+    lon_rad = np.radians(np.asarray(lons, dtype=np.float64))
+
+    N = a / np.sqrt(1 - e2 * np.sin(lat_rad) ** 2)
+
+    x = (N + h) * np.cos(lat_rad) * np.cos(lon_rad)
+    y = (N + h) * np.cos(lat_rad) * np.sin(lon_rad)
+    z = (b ** 2 / a ** 2 * N + h) * np.sin(lat_rad)
+
+    return np.column_stack((x, y, z))
+
+
+def distance_row(xyz, i):
+    """Odległości od miasta i do wszystkich miast"""
+    diff = xyz - xyz[i]
+    return np.sqrt((diff * diff).sum(axis=1))
+
+
+def _distance_blocks(xyz):
+    """Zwraca kolejne bloki wierszy (start, blok) pełnej macierzy odległości"""
+    n = len(xyz)
+    block = max(1, BLOCK_BYTES // max(1, n * 3 * 8))
+    for start in range(0, n, block):
+        diff = xyz[start:start + block, None, :] - xyz[None, :, :]
+        yield start, np.sqrt((diff * diff).sum(axis=2))
+
+
+class PackedDistanceMatrix:
+    """Symetryczna macierz odległości przechowująca tylko górny trójkąt (n*(n-1)/2 wartości).
+
+    d[i, j] zwraca pojedynczą odległość (również dla tablic indeksów), d[i] cały wiersz.
+    """
+
+    def __init__(self, data, n):
+        self.data = data
+        self.n = n
+        self.dtype = data.dtype
+
+    def __len__(self):
+        return self.n
+
+    def _offset(self, i, j):
+        # Zakłada i < j
+        return i * (2 * self.n - i - 1) // 2 + (j - i - 1)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            return self.row(key)
+
+        i, j = key
+        if np.ndim(i) == 0 and np.ndim(j) == 0:
+            if i == j:
+                return self.dtype.type(0)
+            if i > j:
+                i, j = j, i
+            return self.data[self._offset(i, j)]
+
+        i = np.asarray(i, dtype=np.int64)
+        j = np.asarray(j, dtype=np.int64)
+        lo = np.minimum(i, j)
+        hi = np.maximum(i, j)
+        same = lo == hi
+        # Dla i == j indeks jest nieistotny, byle poprawny
+        offsets = np.where(same, 0, self._offset(lo, hi))
+        return np.where(same, 0, self.data[offsets]).astype(self.dtype, copy=False)
+
+    def row(self, i):
+        n = self.n
+        row = np.empty(n, dtype=self.dtype)
+        row[i] = 0
+        if i > 0:
+            js = np.arange(i, dtype=np.int64)
+            row[:i] = self.data[self._offset(js, i)]
+        if i < n - 1:
+            start = self._offset(i, i + 1)
+            row[i + 1:] = self.data[start:start + n - i - 1]
+        return row
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
+
+
+def distance_matrix(xyz, dtype=np.float64, packed=False):
+    """Buduje symetryczną macierz odległości dla tablicy (n, 3) współrzędnych ECEF.
+
+    Domyślnie zwraca pełną tablicę (n, n); przy packed=True tylko górny trójkąt
+    jako PackedDistanceMatrix (o połowę mniej pamięci).
+    """
+    xyz = np.asarray(xyz, dtype=np.float64)
+    n = len(xyz)
+
+    if not packed:
+        distances = np.empty((n, n), dtype=dtype)
+        for start, block in _distance_blocks(xyz):
+            distances[start:start + len(block)] = block
+        return distances
+
+    data = np.empty(n * (n - 1) // 2, dtype=dtype)
+    offset = 0
+    for start, block in _distance_blocks(xyz):
+        for k, row in enumerate(block):
+            i = start + k
+            length = n - i - 1
+            data[offset:offset + length] = row[i + 1:]
+            offset += length
+    return PackedDistanceMatrix(data, n)
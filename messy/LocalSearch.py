@@ -0,0 +1,177 @@
+import time
+from collections import deque
+
+import numpy as np
+
+from SpatialIndex import KDTree
+
+EPSILON = 1e-9
+MAX_SEGMENT = 3
+
+
+def candidate_lists(xyz, k=8):
+    """Listy k najbliższych sąsiadów każdego miasta (z drzewa k-d)"""
+    tree = KDTree(xyz)
+    return [tree.nearest_k(i, k) for i in range(len(tree.xyz))]
+
+
+def _pair_distance(distances):
+    """Szybki dostęp do pojedynczej odległości jako float"""
+    if isinstance(distances, np.ndarray):
+        return distances.item
+    if hasattr(distances, 'distance'):
+        return lambda i, j: float(distances.distance(i, j))
+    return lambda i, j: float(distances[i, j])
+
+
+class _Tour:
+    """Trasa jako cykl w tablicy z odwrotnym indeksem pozycji"""
+
+    def __init__(self, cities):
+        self.order = list(cities)
+        self.n = len(self.order)
+        self.pos = [0] * self.n
+        for p, city in enumerate(self.order):
+            self.pos[city] = p
+
+    def succ(self, city):
+        return self.order[(self.pos[city] + 1) % self.n]
+
+    def pred(self, city):
+        return self.order[self.pos[city] - 1]
+
+    def _reverse(self, i, j):
+        """Odwraca cykliczny fragment pozycji i..j (albo krótsze dopełnienie - krawędzie te same)"""
+        n = self.n
+        length = (j - i) % n + 1
+        if 2 * length > n:
+            i, j = (j + 1) % n, (i - 1) % n
+            length = n - length
+
+        order, pos = self.order, self.pos
+        for _ in range(length // 2):
+            a, b = order[i], order[j]
+            order[i], order[j] = b, a
+            pos[b], pos[a] = i, j
+            i = (i + 1) % n
+            j = (j - 1) % n
+
+    def replace(self, a, b, c, d):
+        """Zamienia krawędzie {a,b}, {c,d} na {a,c}, {b,d} (krawędzie muszą mieć zgodny kierunek)"""
+        if self.succ(a) == b:
+            self._reverse(self.pos[b], self.pos[c])
+        else:
+            self._reverse(self.pos[a], self.pos[d])
+
+
+def _try_two_opt(tour, dist, neighbors, a):
+    for step in (tour.succ, tour.pred):
+        b = step(a)
+        d_ab = dist(a, b)
+        for c in neighbors[a]:
+            d_ac = dist(a, c)
+            if d_ac >= d_ab:
+                break
+            d = step(c)
+            if c == b or d == a:
+                continue
+            delta = d_ac + dist(b, d) - d_ab - dist(c, d)
+            if delta < -EPSILON:
+                tour.replace(a, b, c, d)
+                return delta, (a, b, c, d)
+    return 0.0, ()
+
+
+def _try_or_opt(tour, dist, neighbors, a):
+    s1 = a
+    s2 = a
+    segment = [a]
+    for _ in range(min(MAX_SEGMENT, tour.n - 3)):
+        p, nx = tour.pred(s1), tour.succ(s2)
+        if nx == p:
+            break
+        gain = dist(p, s1) + dist(s2, nx) - dist(p, nx)
+
+        for c in neighbors[s1]:
+            d_c = dist(c, s1)
+            if d_c >= gain:
+                break
+            if c in segment:
+                continue
+            # Wstawienie tak, by s1 sąsiadowało z c: (c, s1..s2, e) albo (e, s2..s1, c)
+            for x, y, reverse in ((c, tour.succ(c), False), (tour.pred(c), c, True)):
+                if x in segment or y in segment:
+                    continue
+                if reverse:
+                    added = dist(x, s2) + d_c - dist(x, y)
+                else:
+                    added = d_c + dist(s2, y) - dist(x, y)
+                delta = added - gain
+                if delta < -EPSILON:
+                    tour.replace(p, s1, x, y)
+                    tour.replace(p, x, nx, s2)
+                    if not reverse:
+                        tour.replace(x, s2, s1, y)
+                    return delta, (p, nx, s1, s2, x, y)
+
+        s2 = nx
+        segment.append(s2)
+    return 0.0, ()
+
+
+def local_search(route, distances, neighbors, max_passes=None, verbose=False):
+    """Poprawia trasę ruchami 2-opt i Or-opt ograniczonymi do list kandydatów (neighbors).
+
+    route to trasa w formacie nearest_neighbor / simulated_annealing (miasto startowe na obu
+    końcach). Bity "don't look" sprawiają, że kolejne przejścia sprawdzają tylko miasta,
+    przy których coś się zmieniło. Zwraca (trasa, długość, historia przejść), gdzie historia
+    zawiera długość trasy i czas każdego przejścia.
+    """
+    start_city = route[0]
+    cities = route[:-1] if len(route) > 1 and route[-1] == route[0] else list(route)
+    dist = _pair_distance(distances)
+    tour = _Tour(cities)
+    length = sum(dist(cities[i - 1], cities[i]) for i in range(len(cities)))
+    history = []
+
+    if tour.n >= 5:
+        queue = deque(cities)
+        active = [False] * len(distances)
+        for city in cities:
+            active[city] = True
+
+        pass_no = 0
+        while queue and (max_passes is None or pass_no < max_passes):
+            pass_start = time.perf_counter()
+            improvements = 0
+            # Jedno przejście obejmuje miasta aktywne na jego początku
+            for _ in range(len(queue)):
+                a = queue.popleft()
+                active[a] = False
+
+                delta, touched = _try_two_opt(tour, dist, neighbors, a)
+                if not touched:
+                    delta, touched = _try_or_opt(tour, dist, neighbors, a)
+                if not touched:
+                    continue
+
+                length += delta
+                improvements += 1
+                for city in (a,) + touched:
+                    if not active[city]:
+                        active[city] = True
+                        queue.append(city)
+
+            pass_no += 1
+            elapsed = time.perf_counter() - pass_start
+            history.append({'pass': pass_no, 'length': length, 'improvements': improvements, 'time': elapsed})
+            if verbose:
+                print(f"Pass {pass_no:3d}: length = {length:.2f} km, improvements = {improvements}, "
+                      f"time = {elapsed:.3f} s")
+
+    p = tour.pos[start_city]
+    result = tour.order[p:] + tour.order[:p]
+    result.append(start_city)
+    # Długość liczona od nowa, bez błędów zaokrągleń z sumowania przyrostów
+    total_distance = sum(dist(result[i], result[i + 1]) for i in range(len(result) - 1))
+    return result, total_distance, history
@@ -0,0 +1,157 @@
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from CoolingSchedules import GeometricSchedule, TimeBudgetSchedule
+from Geometry import PackedDistanceMatrix
+from DistanceOracle import DistanceOracle
+from SalesmanVol2 import simulated_annealing
+
+# Odległości podłączone do pamięci współdzielonej w procesie roboczym
+_distances = None
+_shm = None
+
+
+def _share(distances):
+    """Kopiuje dane odległości do pamięci współdzielonej - zwraca (pamięć, opis dla procesów)"""
+    if isinstance(distances, PackedDistanceMatrix):
+        array, kind, extra = distances.data, 'packed', distances.n
+    elif isinstance(distances, DistanceOracle):
+        array, kind, extra = distances.xyz, 'oracle', (distances.cache_size, distances.dtype.str)
+    else:
+        array, kind, extra = np.asarray(distances), 'matrix', None
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, (shm.name, kind, array.shape, array.dtype.str, extra)
+
+
+def _attach(spec):
+    """Inicjalizacja procesu roboczego - widok na odległości bez kopiowania"""
+    global _distances, _shm
+    name, kind, shape, dtype, extra = spec
+    _shm = shared_memory.SharedMemory(name=name)
+    array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_shm.buf)
+
+    if kind == 'packed':
+        _distances = PackedDistanceMatrix(array, extra)
+    elif kind == 'oracle':
+        _distances = DistanceOracle(array, cache_size=extra[0], dtype=extra[1])
+    else:
+        _distances = array
+
+
+def _run_chain(chain, seed, start_index, initial_solution, kwargs, time_budget=None, patience=None):
+    random.seed(seed)
+    # Harmonogram tworzony w procesie roboczym - budżet czasu liczy się od startu łańcucha
+    if time_budget is not None:
+        kwargs = dict(kwargs, schedule=TimeBudgetSchedule(kwargs['initial_temp'], kwargs['min_temp'],
+                                                          time_budget, patience=patience))
+    elif patience is not None:
+        kwargs = dict(kwargs, schedule=GeometricSchedule(kwargs['initial_temp'], kwargs['cooling_rate'],
+                                                         kwargs['min_temp'], kwargs['max_iterations'],
+                                                         patience=patience))
+    start = time.perf_counter()
+    route, distance = simulated_annealing(_distances, start_index, initial_solution=initial_solution, **kwargs)
+    return chain, route, distance, time.perf_counter() - start
+
+
+class AnnealingPool:
+    """Procesy robocze z odległościami w pamięci współdzielonej, wspólne dla wielu wywołań parallel_annealing.
+
+    Kopia odległości i start procesów kosztują raz, a nie przy każdym zapytaniu. Zamknij close().
+    """
+
+    def __init__(self, distances, workers=None):
+        self.workers = workers or os.cpu_count()
+        self.shm, spec = _share(distances)
+        try:
+            self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_attach, initargs=(spec,))
+        except BaseException:
+            self.shm.close()
+            self.shm.unlink()
+            raise
+        self.closed = False
+
+    def submit(self, fn, *args):
+        return self.executor.submit(fn, *args)
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.executor.shutdown()
+            self.shm.close()
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def parallel_annealing(distances, start_index, chains=None, workers=None, seed=None, exchange_interval=None,
+                       initial_temp=10000, cooling_rate=0.99, min_temp=0.1, max_iterations=1000,
+                       move_types=('swap',), time_budget=None, patience=None, pool=None):
+    """Równoległe symulowane wyżarzanie - niezależne łańcuchy w osobnych procesach.
+
+    Odległości trafiają do pamięci współdzielonej zamiast być kopiowane do każdego procesu.
+    Przy exchange_interval łańcuchy co tyle iteracji startują od najlepszej dotąd trasy,
+    kontynuując schładzanie od osiągniętej temperatury.
+    time_budget (sekundy) zamienia limit iteracji na limit czasu każdego łańcucha
+    (TimeBudgetSchedule od initial_temp do min_temp, jak 'sa' w Tsp.py), a patience kończy
+    łańcuch po tylu iteracjach bez poprawy.
+    pool (AnnealingPool zbudowany dla tych samych odległości) pozwala użyć tych samych procesów
+    w wielu wywołaniach; bez niego pula jest tworzona i zamykana w tym wywołaniu.
+
+    Zwraca (najlepsza trasa, jej długość, statystyki łańcuchów).
+    """
+    if time_budget is not None and exchange_interval is not None:
+        raise ValueError("exchange_interval counts iterations and cannot be combined with time_budget")
+    own_pool = pool is None
+    if own_pool:
+        pool = AnnealingPool(distances, workers)
+    chains = chains or pool.workers
+    seeds = random.Random(seed).sample(range(2 ** 32), chains)
+    interval = exchange_interval or max_iterations
+
+    stats = [{'chain': k, 'seed': seeds[k], 'distances': [], 'time': 0.0} for k in range(chains)]
+    best_route = None
+    best_distance = float('inf')
+
+    try:
+        done = 0
+        round_no = 0
+        temp = initial_temp
+        while done < max_iterations and temp > min_temp:
+            iterations = min(interval, max_iterations - done)
+            kwargs = {'initial_temp': temp, 'cooling_rate': cooling_rate, 'min_temp': min_temp,
+                      'max_iterations': iterations, 'move_types': move_types}
+            futures = [pool.submit(_run_chain, k, seeds[k] + round_no, start_index, best_route, kwargs,
+                                   time_budget, patience)
+                       for k in range(chains)]
+
+            for future in futures:
+                chain, route, distance, elapsed = future.result()
+                stats[chain]['distances'].append(distance)
+                stats[chain]['time'] += elapsed
+                if distance < best_distance:
+                    best_route, best_distance = route, distance
+
+            if time_budget is not None:
+                break
+            done += iterations
+            round_no += 1
+            temp *= cooling_rate ** iterations
+    finally:
+        if own_pool:
+            pool.close()
+
+    for chain_stats in stats:
+        chain_stats['best_distance'] = min(chain_stats['distances'], default=float('inf'))
+
+    return best_route, best_distance, stats
@@ -1,40 +1,18 @@
-from math import sin, cos, sqrt, radians, exp
+from math import exp
 import random
-import copy
 
-a = 6378.137
-b = 6356.752
-e2 = 1 - (b ** 2 / a ** 2)
+import numpy as np
 
-
-def latlon_to_xyz(lat, lon, h=0):
-    lat_rad = radians(lat)
-    lon_rad = radians(lon)
-
-    N = a / sqrt(1 - e2 * sin(lat_rad) ** 2)
-
-    x = (N + h) * cos(lat_rad) * cos(lon_rad)
-    y = (N + h) * cos(lat_rad) * sin(lon_rad)
-    z = (b ** 2 / a ** 2 * N + h) * sin(lat_rad)
-
-    return x, y, z
-
-
-def euclidean_distance(coord1, coord2):
-    x1, y1, z1 = coord1
-    x2, y2, z2 = coord2
-
-    distance = sqrt((x2 - x1) ** 2 + (y2 - y1) ** 2 + (z2 - z1) ** 2)
-    return distance
+from CityLoader import load_cities
+from CoolingSchedules import GeometricSchedule
+from DistanceOracle import distance_provider
 
 
 def calculate_total_distance(route, distances):
     """Oblicza całkowitą długość trasy"""
-    total_distance = 0
-    n = len(route)
-    for i in range(n - 1):
-        total_distance += distances[route[i]][route[i + 1]]
-    total_distance += distances[route[-1]][route[0]]  # Powrót do miasta startowego
+    route = np.asarray(route)
+    total_distance = float(distances[route[:-1], route[1:]].sum())
+    total_distance += float(distances[route[-1], route[0]])  # Powrót do miasta startowego
     return total_distance
 
 
@@ -53,110 +31,158 @@ def get_neighbor_solution(current_solution):
     neighbor = current_solution.copy()
 
     # Wybierz dwa różne indeksy do zamiany (pomijając pierwszy i ostatni element - miasto startowe)
-    idx1, idx2 = random.sample(range(1, len(neighbor) - 1), 2
+    idx1, idx2 = random.sample(range(1, len(neighbor) - 1), 2)
     neighbor[idx1], neighbor[idx2] = neighbor[idx2], neighbor[idx1]
 
     return neighbor
 
 
+MOVE_TYPES = ('swap', '2opt', 'oropt')
+MAX_OR_OPT_SEGMENT = 3
+
+
+def random_move(route, move_types=('swap',)):
+    """Losuje ruch (typ, i, j, k) dla trasy z miastem startowym na obu końcach"""
+    kind = move_types[0] if len(move_types) == 1 else random.choice(move_types)
+    last = len(route) - 1
+
+    if kind == 'oropt' and last > 3:
+        # Odcinek route[i:i+length] wstawiany za pozycję p (poza odcinkiem i jego poprzednikiem)
+        length = random.randint(1, min(MAX_OR_OPT_SEGMENT, last - 3))
+        i = random.randint(1, last - length)
+        p = random.randrange(last - length - 1)
+        if p >= i - 1:
+            p += length + 1
+        return kind, i, length, p
+
+    idx1, idx2 = random.sample(range(1, last), 2)
+    if kind == 'oropt':
+        kind = 'swap'
+    return kind, min(idx1, idx2), max(idx1, idx2), None
+
+
+def move_delta(route, distances, move):
+    """Zmiana długości trasy po wykonaniu ruchu - liczona tylko z krawędzi, których dotyczy"""
+    kind, i, j, p = move
+
+    if kind == 'swap':
+        a, b = route[i - 1], route[i]
+        c, d = route[j], route[j + 1]
+        if j == i + 1:
+            return distances[a, c] + distances[b, d] - distances[a, b] - distances[c, d]
+        e, f = route[j - 1], route[i + 1]
+        return (distances[a, c] + distances[c, f] + distances[e, b] + distances[b, d]
+                - distances[a, b] - distances[b, f] - distances[e, c] - distances[c, d])
+
+    if kind == '2opt':
+        a, b = route[i - 1], route[i]
+        c, d = route[j], route[j + 1]
+        return distances[a, c] + distances[b, d] - distances[a, b] - distances[c, d]
+
+    # oropt: j to długość przenoszonego odcinka
+    prev, first, last, nxt = route[i - 1], route[i], route[i + j - 1], route[i + j]
+    x, y = route[p], route[p + 1]
+    return (distances[prev, nxt] - distances[prev, first] - distances[last, nxt]
+            + distances[x, first] + distances[last, y] - distances[x, y])
+
+
+def apply_move(route, move):
+    """Wykonuje ruch w miejscu, bez kopiowania całej trasy"""
+    kind, i, j, p = move
+
+    if kind == 'swap':
+        route[i], route[j] = route[j], route[i]
+    elif kind == '2opt':
+        route[i:j + 1] = route[j:i - 1:-1]
+    elif p < i:
+        route[p + 1:i + j] = route[i:i + j] + route[p + 1:i]
+    else:
+        route[i:p + 1] = route[i + j:p + 1] + route[i:i + j]
+
+
 def simulated_annealing(distances, start_index, initial_temp=10000, cooling_rate=0.99, min_temp=0.1,
-                        max_iterations=1000):
-    """Implementacja algorytmu symulowanego wyżarzania dla TSP"""
+                        max_iterations=1000, move_types=('swap',), initial_solution=None, schedule=None):
+    """Implementacja algorytmu symulowanego wyżarzania dla TSP.
+
+    Koszt ruchu liczony jest przyrostowo (move_delta), a zaakceptowane ruchy wykonywane
+    w miejscu. move_types to dowolny podzbiór MOVE_TYPES. initial_solution pozwala
+    kontynuować od gotowej trasy zamiast losowej. schedule to harmonogram z minimum/schedules.py
+    (budżet czasu, ponowne podgrzewanie, schładzanie adaptacyjne, zatrzymanie bez poprawy);
+    domyślnie temp *= cooling_rate do min_temp lub max_iterations.
+    """
     n = len(distances)
-    current_solution = generate_initial_solution(n, start_index)
+    if initial_solution is None:
+        current_solution = generate_initial_solution(n, start_index)
+    else:
+        current_solution = list(initial_solution)
     current_distance = calculate_total_distance(current_solution, distances)
 
+    if n < 3:
+        return current_solution, current_distance
+
     best_solution = current_solution.copy()
     best_distance = current_distance
+    # Najlepsze rozwiązanie to bieżąca trasa - kopia dopiero gdy ją opuszczamy
+    current_is_best = False
 
-    temp = initial_temp
-    iteration = 0
+    if schedule is None:
+        schedule = GeometricSchedule(initial_temp, cooling_rate, min_temp, max_iterations)
+    temp = schedule.start()
 
-    while temp > min_temp and iteration < max_iterations:
-        # Generuj sąsiednie rozwiązanie
-        neighbor_solution = get_neighbor_solution(current_solution)
-        neighbor_distance = calculate_total_distance(neighbor_solution, distances)
-
-        # Oblicz różnicę w długości trasy
-        delta = neighbor_distance - current_distance
+    while schedule.running():
+        # Wylosuj ruch i policz zmianę długości trasy
+        move = random_move(current_solution, move_types)
+        delta = move_delta(current_solution, distances, move)
 
         # Jeśli nowe rozwiązanie jest lepsze, zaakceptuj je
+        accepted = improved = False
         if delta < 0:
-            current_solution = neighbor_solution
-            current_distance = neighbor_distance
+            apply_move(current_solution, move)
+            current_distance += delta
+            accepted = True
 
             # Sprawdź czy to nowe najlepsze rozwiązanie
             if current_distance < best_distance:
-                best_solution = current_solution.copy()
                 best_distance = current_distance
+                current_is_best = True
+                improved = True
         else:
             # Jeśli gorsze, zaakceptuj z pewnym prawdopodobieństwem
             probability = exp(-delta / temp)
             if random.random() < probability:
-                current_solution = neighbor_solution
-                current_distance = neighbor_distance
+                if current_is_best:
+                    best_solution = current_solution.copy()
+                    current_is_best = False
+                apply_move(current_solution, move)
+                current_distance += delta
+                accepted = True
 
         # Schładzanie
-        temp *= cooling_rate
-        iteration += 1
-
-    return best_solution, best_distance
-
-
-def parse_coordinate(coord_str):
-    coord_str = coord_str.replace('°', '.').replace("'", '')
-    direction = coord_str[-1]
-    value = float(coord_str[:-1])
-
-    if direction in ['S', 'W']:
-        value = -value
-
-    return value
-
-
-# Wczytanie danych o miastach
-cities = []
-with open('citiesTest.txt', 'r') as file:
-    for line in file:
-        parts = line.strip().split()
-
-        lon_str = parts[-2]
-        lat_str = parts[-1]
+        temp = schedule.update(accepted, improved)
 
-        name = ' '.join(parts[:-2])
+    if current_is_best:
+        best_solution = current_solution.copy()
 
-        try:
-            lon = parse_coordinate(lon_str)
-            lat = parse_coordinate(lat_str)
-            cities.append((name, lat, lon))
-        except ValueError as e:
-            print(f"Skipping line due to parsing error: {line.strip()}")
-            print(f"Error: {e}")
+    # Suma przyrostów może odbiegać o błąd zaokrąglenia - wynik liczony dokładnie
+    return best_solution, calculate_total_distance(best_solution, distances)
 
-# Przygotowanie macierzy odległości
-city_coords = [latlon_to_xyz(lat, lon) for name, lat, lon in cities]
-n = len(city_coords)
-distances = [[0] * n for _ in range(n)]
-for i in range(n):
-    for j in range(n):
-        distances[i][j] = euclidean_distance(city_coords[i], city_coords[j])
 
-# Interakcja z użytkownikiem
-city_a = input("Enter the starting city (City A): ")
-city_a_index = None
+if __name__ == '__main__':
+    # Wczytanie danych o miastach i przygotowanie macierzy odległości
+    cities = load_cities('citiesTest.txt')
+    distances = distance_provider(cities.xyz)
 
-for i, (name, _, _) in enumerate(cities):
-    if name == city_a:
-        city_a_index = i
-        break
+    # Interakcja z użytkownikiem
+    city_a = input("Enter the starting city (City A): ")
+    city_a_index = cities.index(city_a)
 
-if city_a_index is None:
-    print(f"Error: City '{city_a}' not found in the list.")
-else:
-    print("\nRunning Simulated Annealing algorithm...")
-    route, total_distance = simulated_annealing(distances, city_a_index)
+    if city_a_index is None:
+        print(f"Error: City '{city_a}' not found in the list.")
+    else:
+        print("\nRunning Simulated Annealing algorithm...")
+        route, total_distance = simulated_annealing(distances, city_a_index)
 
-    print("\nOptimal route found:")
-    for i in route:
-        print(cities[i][0])
-    print(f"\nTotal distance: {total_distance:.2f} kilometers")
\ No newline at end of file
+        print("\nOptimal route found:")
+        for i in route:
+            print(cities[i][0])
+        print(f"\nTotal distance: {total_distance:.2f} kilometers")
\ No newline at end of file
@@ -0,0 +1,189 @@
+import heapq
+from math import sqrt
+
+import numpy as np
+
+
+class _Node:
+    __slots__ = ('lo', 'hi', 'left', 'right', 'parent', 'count', 'indices', 'points')
+
+    def __init__(self, lo, hi, parent):
+        self.lo = lo
+        self.hi = hi
+        self.parent = parent
+        self.left = None
+        self.right = None
+        self.count = 0
+        self.indices = None
+        self.points = None
+
+
+class KDTree:
+    """Drzewo k-d nad punktami ECEF z usuwaniem punktów (np. odwiedzonych miast).
+
+    Liście przechowują do leaf_size punktów; każdy węzeł zna liczbę żywych punktów
+    w poddrzewie, więc puste poddrzewa są pomijane bez schodzenia w dół.
+    """
+
+    def __init__(self, xyz, leaf_size=16):
+        self.xyz = np.asarray(xyz, dtype=np.float64)
+        self.leaf_size = leaf_size
+        self.leaf_of = [None] * len(self.xyz)
+        self.root = self._build(np.arange(len(self.xyz)), None)
+
+    def __len__(self):
+        return self.root.count
+
+    def _build(self, indices, parent):
+        points = self.xyz[indices]
+        node = _Node(tuple(points.min(axis=0).tolist()), tuple(points.max(axis=0).tolist()), parent)
+        node.count = len(indices)
+
+        if len(indices) <= self.leaf_size:
+            node.indices = indices
+            node.points = points
+            for i in indices.tolist():
+                self.leaf_of[i] = node
+            return node
+
+        # Podział wzdłuż osi o największym rozrzucie, na medianie
+        axis = int(np.argmax(np.subtract(node.hi, node.lo)))
+        order = np.argsort(points[:, axis], kind='stable')
+        half = len(indices) // 2
+        node.left = self._build(indices[order[:half]], node)
+        node.right = self._build(indices[order[half:]], node)
+        return node
+
+    def remove(self, i):
+        """Usuwa punkt i z drzewa"""
+        leaf = self.leaf_of[i]
+        if leaf is None:
+            return
+        self.leaf_of[i] = None
+
+        keep = leaf.indices != i
+        leaf.indices = leaf.indices[keep]
+        leaf.points = leaf.points[keep]
+
+        node = leaf
+        while node is not None:
+            node.count -= 1
+            node = node.parent
+
+    @staticmethod
+    def _box_distance(node, q):
+        """Dolne ograniczenie odległości od q do dowolnego punktu w prostopadłościanie węzła"""
+        total = 0.0
+        for lo, hi, c in zip(node.lo, node.hi, q):
+            if c < lo:
+                total += (lo - c) * (lo - c)
+            elif c > hi:
+                total += (c - hi) * (c - hi)
+        return sqrt(total)
+
+    def nearest(self, i):
+        """Najbliższy żywy punkt do punktu i - zwraca (indeks, odległość).
+
+        Przy równych odległościach wygrywa mniejszy indeks, tak jak w przeszukiwaniu brute-force.
+        """
+        q_arr = self.xyz[i]
+        q = tuple(q_arr.tolist())
+        best_index = -1
+        best_distance = float('inf')
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.count == 0:
+                continue
+            # Margines chroni przed błędem zaokrąglenia dolnego ograniczenia przy remisach
+            if self._box_distance(node, q) > best_distance * (1 + 1e-12):
+                continue
+
+            if node.indices is not None:
+                diff = node.points - q_arr
+                d = np.sqrt((diff * diff).sum(axis=1))
+                k = int(d.argmin())
+                if d[k] <= best_distance:
+                    candidates = node.indices[d == d[k]]
+                    index = int(candidates.min())
+                    if d[k] < best_distance or index < best_index:
+                        best_distance = float(d[k])
+                        best_index = index
+                continue
+
+            # Bliższe dziecko na szczyt stosu
+            if self._box_distance(node.left, q) <= self._box_distance(node.right, q):
+                stack.append(node.right)
+                stack.append(node.left)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return best_index, best_distance
+
+    def nearest_k(self, i, k):
+        """k najbliższych żywych punktów do punktu i (bez niego samego), posortowane rosnąco"""
+        q_arr = self.xyz[i]
+        q = tuple(q_arr.tolist())
+        heap = []  # (-odległość, -indeks) - na szczycie najdalszy z dotychczasowych
+        limit = float('inf')
+
+        stack = [self.root]
+        while stack:
+            node = stack.pop()
+            if node.count == 0 or self._box_distance(node, q) > limit * (1 + 1e-12):
+                continue
+
+            if node.indices is not None:
+                diff = node.points - q_arr
+                d = np.sqrt((diff * diff).sum(axis=1))
+                for index, distance in zip(node.indices.tolist(), d.tolist()):
+                    if index == i:
+                        continue
+                    item = (-distance, -index)
+                    if len(heap) < k:
+                        heapq.heappush(heap, item)
+                    elif item > heap[0]:
+                        heapq.heapreplace(heap, item)
+                    if len(heap) == k:
+                        limit = -heap[0][0]
+                continue
+
+            if self._box_distance(node.left, q) <= self._box_distance(node.right, q):
+                stack.append(node.right)
+                stack.append(node.left)
+            else:
+                stack.append(node.left)
+                stack.append(node.right)
+
+        return [-index for _, index in sorted(heap, reverse=True)]
+
+
+def nearest_neighbor_kdtree(xyz, start_index, leaf_size=16):
+    """Heurystyka najbliższego sąsiada z drzewem k-d - ta sama trasa co nearest_neighbor, ok. O(n log n)"""
+    xyz = np.asarray(xyz, dtype=np.float64)
+    n = len(xyz)
+    tree = KDTree(xyz, leaf_size)
+    route = []
+    total_distance = 0
+
+    current_city = start_index
+    route.append(current_city)
+    tree.remove(current_city)
+
+    while len(route) < n:
+        nearest_city, nearest_distance = tree.nearest(current_city)
+        if nearest_city < 0:
+            break
+
+        route.append(nearest_city)
+        tree.remove(nearest_city)
+        total_distance += nearest_distance
+        current_city = nearest_city
+
+    diff = xyz[start_index] - xyz[route[-1]]
+    total_distance += float(np.sqrt((diff * diff).sum()))
+    route.append(start_index)
+
+    return route, total_distance
@@ -0,0 +1,169 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+from CityLoader import load_cities
+from CoolingSchedules import GeometricSchedule, TimeBudgetSchedule
+from DistanceOracle import distance_provider, MATRIX_CITY_LIMIT
+from LocalSearch import local_search, candidate_lists
+from ParallelAnnealing import AnnealingPool, parallel_annealing
+from Salesman import nearest_neighbor
+from SalesmanVol2 import simulated_annealing, MOVE_TYPES
+from SpatialIndex import nearest_neighbor_kdtree
+
+ALGORITHMS = ('nn', 'kdtree', 'sa', 'parallel')
+
+
+class TspProblem:
+    """Wczytane miasta z odległościami - budowane raz i używane dla wielu zapytań.
+
+    Pula procesów dla 'parallel' (z odległościami w pamięci współdzielonej) też jest tworzona
+    raz, przy pierwszym zapytaniu, i zamykana przez close().
+    """
+
+    def __init__(self, cities, distances):
+        self.cities = cities
+        self.distances = distances
+        self._neighbors = None
+        self._pool = None
+
+    def neighbors(self, k=8):
+        """Listy kandydatów dla przeszukiwania lokalnego (liczone przy pierwszym użyciu)"""
+        if self._neighbors is None:
+            self._neighbors = candidate_lists(self.cities.xyz, min(k, len(self.cities) - 1))
+        return self._neighbors
+
+    def annealing_pool(self, workers=None):
+        """AnnealingPool dla tych odległości - nowy tylko, gdy zmieniła się liczba procesów"""
+        if self._pool is not None and workers is not None and self._pool.workers != workers:
+            self._pool.close()
+            self._pool = None
+        if self._pool is None:
+            self._pool = AnnealingPool(self.distances, workers)
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def city_index(self, city):
+        """Numer miasta po nazwie (albo numer podany wprost jako liczba)"""
+        if isinstance(city, int):
+            return city if 0 <= city < len(self.cities) else None
+        return self.cities.index(city)
+
+
+def load_problem(path, use_cache=True, max_matrix_cities=MATRIX_CITY_LIMIT):
+    cities = load_cities(path, use_cache=use_cache)
+    return TspProblem(cities, distance_provider(cities.xyz, max_matrix_cities=max_matrix_cities))
+
+
+def solve(problem, start, algorithm='nn', seed=None, iterations=10000, local=False, workers=None,
+          time_budget=None, patience=None):
+    """Rozwiązuje TSP z miasta start - zwraca (trasa, długość w km).
+
+    algorithm: 'nn' (najbliższy sąsiad), 'kdtree' (najbliższy sąsiad z drzewem k-d),
+    'sa' (symulowane wyżarzanie), 'parallel' (wyżarzanie na wielu procesach).
+    local=True dodatkowo poprawia wynik przeszukiwaniem lokalnym 2-opt/Or-opt.
+    Dla 'sa' i 'parallel' time_budget (sekundy) zamienia budżet iteracji na budżet czasu,
+    a patience kończy wcześniej po tylu iteracjach bez poprawy.
+    """
+    start_index = problem.city_index(start)
+    if start_index is None:
+        raise ValueError(f"City '{start}' not found in the list.")
+
+    # Temperatura schodzi od 10000 do 0.1 dokładnie w zadanym budżecie iteracji
+    cooling_rate = (0.1 / 10000) ** (1 / max(1, iterations))
+
+    if algorithm == 'nn':
+        route, total_distance = nearest_neighbor(problem.cities, problem.distances, start_index)
+    elif algorithm == 'kdtree':
+        route, total_distance = nearest_neighbor_kdtree(problem.cities.xyz, start_index)
+    elif algorithm == 'sa':
+        random.seed(seed)
+        if time_budget is not None:
+            schedule = TimeBudgetSchedule(10000, 0.1, time_budget, patience=patience)
+        else:
+            schedule = GeometricSchedule(10000, cooling_rate, 0.1, iterations, patience=patience)
+        route, total_distance = simulated_annealing(problem.distances, start_index, move_types=MOVE_TYPES,
+                                                    schedule=schedule)
+    elif algorithm == 'parallel':
+        route, total_distance, _ = parallel_annealing(problem.distances, start_index, seed=seed,
+                                                      cooling_rate=cooling_rate, max_iterations=iterations,
+                                                      move_types=MOVE_TYPES, time_budget=time_budget,
+                                                      patience=patience, pool=problem.annealing_pool(workers))
+    else:
+        raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {', '.join(ALGORITHMS)}")
+
+    if local:
+        route, total_distance, _ = local_search(route, problem.distances, problem.neighbors())
+
+    return route, total_distance
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Problem komiwojażera dla plików z miastami")
+    parser.add_argument('files', nargs='+', help="pliki z miastami ('nazwa lon lat' w każdej linii)")
+    parser.add_argument('-s', '--start', action='append', default=[],
+                        help="miasto startowe (można podać wiele razy)")
+    parser.add_argument('--all-starts', action='store_true', help="rozwiąż z każdego miasta w pliku")
+    parser.add_argument('-a', '--algorithm', choices=ALGORITHMS, default='nn')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('-i', '--iterations', type=int, default=10000, help="budżet iteracji wyżarzania")
+    parser.add_argument('--time-budget', type=float, default=None,
+                        help="limit czasu wyżarzania ('sa', 'parallel') w sekundach (zamiast limitu iteracji)")
+    parser.add_argument('--patience', type=int, default=None,
+                        help="zakończ wyżarzanie ('sa', 'parallel') po tylu iteracjach bez poprawy")
+    parser.add_argument('--local-search', action='store_true', help="popraw trasę przez 2-opt/Or-opt")
+    parser.add_argument('--workers', type=int, default=None, help="liczba procesów dla 'parallel'")
+    parser.add_argument('--no-cache', action='store_true', help="nie używaj binarnego cache miast")
+    parser.add_argument('--route', action='store_true', help="wypisz nazwy miast na trasie")
+    parser.add_argument('--json', action='store_true', help="wyniki jako JSON, jeden obiekt na linię")
+    args = parser.parse_args(argv)
+
+    if not args.start and not args.all_starts:
+        parser.error("give at least one --start or --all-starts")
+
+    failed = False
+    for path in args.files:
+        # Odległości i pula procesów zostają na cały plik - zamykane po ostatnim zapytaniu
+        with load_problem(path, use_cache=not args.no_cache) as problem:
+            starts = range(len(problem.cities)) if args.all_starts else args.start
+
+            for start in starts:
+                query_start = time.perf_counter()
+                try:
+                    route, total_distance = solve(problem, start, args.algorithm, args.seed, args.iterations,
+                                                  args.local_search, args.workers, args.time_budget, args.patience)
+                except ValueError as e:
+                    print(f"Error: {e}", file=sys.stderr)
+                    failed = True
+                    continue
+                elapsed = time.perf_counter() - query_start
+
+                names = [problem.cities[i][0] for i in route]
+                if args.json:
+                    result = {'file': path, 'start': names[0], 'algorithm': args.algorithm,
+                              'distance': total_distance, 'time': elapsed}
+                    if args.route:
+                        result['route'] = names
+                    print(json.dumps(result, ensure_ascii=False))
+                else:
+                    print(f"{path}: {names[0]} [{args.algorithm}] {total_distance:.2f} km ({elapsed:.3f} s)")
+                    if args.route:
+                        print(' -> '.join(names))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,51 @@
+import argparse
+import time
+
+import numpy as np
+
+from Geometry import latlon_to_xyz_array
+from DistanceOracle import DistanceOracle
+from Salesman import nearest_neighbor
+from SpatialIndex import nearest_neighbor_kdtree
+
+
+def random_cities(n, seed=0):
+    """Losowe miasta rozłożone równomiernie na kuli"""
+    rng = np.random.default_rng(seed)
+    lats = np.degrees(np.arcsin(rng.uniform(-1, 1, n)))
+    lons = rng.uniform(-180, 180, n)
+    return latlon_to_xyz_array(lats, lons)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Porównanie nearest_neighbor: brute-force vs drzewo k-d")
+    parser.add_argument('sizes', nargs='*', type=int, default=[1000, 10000, 100000])
+    parser.add_argument('--brute-limit', type=int, default=10000,
+                        help="największe n, dla którego uruchamiany jest brute-force")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'n':>8} | {'brute [s]':>10} | {'k-d [s]':>10} | {'przyspieszenie':>14} | trasa")
+    for n in args.sizes:
+        xyz = random_cities(n, args.seed)
+
+        start = time.perf_counter()
+        kd_route, kd_distance = nearest_neighbor_kdtree(xyz, 0)
+        kd_time = time.perf_counter() - start
+
+        if n > args.brute_limit:
+            print(f"{n:8d} | {'-':>10} | {kd_time:10.3f} | {'-':>14} | {kd_distance:.2f} km")
+            continue
+
+        # Wiersze liczone na żądanie - pełna macierz dla 100k miast nie zmieści się w pamięci
+        distances = DistanceOracle(xyz, cache_size=0)
+        start = time.perf_counter()
+        route, total_distance = nearest_neighbor(xyz, distances, 0)
+        brute_time = time.perf_counter() - start
+
+        same = "identyczna" if route == kd_route and total_distance == kd_distance else "RÓŻNA"
+        print(f"{n:8d} | {brute_time:10.3f} | {kd_time:10.3f} | {brute_time / kd_time:13.1f}x | {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,11 @@
+import pickle
+
+from CoolingSchedules import AdaptiveSchedule, GeometricSchedule, ReheatingSchedule, TimeBudgetSchedule
+
+
+def test_schedules_survive_pickle_round_trip():
+    for schedule in (GeometricSchedule(10, 0.9, 0.1, 100), TimeBudgetSchedule(10, 0.1, 1.0),
+                     ReheatingSchedule(10, 0.9, reheat_after=50), AdaptiveSchedule(10, window=20)):
+        copy = pickle.loads(pickle.dumps(schedule))
+        assert type(copy) is type(schedule)
+        assert vars(copy) == vars(schedule)
@@ -0,0 +1,45 @@
+from collections import OrderedDict
+
+import numpy as np
+
+_BRAK = object()
+
+
+class PamiecEwaluacji:
+    """Pamięć podręczna wartości kosztownej funkcji f z kwantyzacją argumentu.
+
+    Punkty różniące się o mniej niż `tolerancja` (w każdym wymiarze) trafiają do tej samej
+    komórki i dostają zapamiętaną wartość. Najdawniej używane wpisy są usuwane po
+    przekroczeniu `pojemnosc`.
+    """
+
+    def __init__(self, f, tolerancja=1e-9, pojemnosc=100000):
+        self.f = f
+        self.tolerancja = tolerancja
+        self.pojemnosc = pojemnosc
+        self.wartosci = OrderedDict()
+        self.trafienia = 0
+        self.chybienia = 0
+
+    def klucz(self, x):
+        if isinstance(x, np.ndarray):
+            return np.rint(x / self.tolerancja).astype(np.int64).tobytes()
+        return round(x / self.tolerancja)
+
+    def __call__(self, x):
+        klucz = self.klucz(x)
+        wartosc = self.wartosci.get(klucz, _BRAK)
+        if wartosc is not _BRAK:
+            self.wartosci.move_to_end(klucz)
+            self.trafienia += 1
+            return wartosc
+
+        self.chybienia += 1
+        wartosc = self.f(x)
+        self.wartosci[klucz] = wartosc
+        if len(self.wartosci) > self.pojemnosc:
+            self.wartosci.popitem(last=False)
+        return wartosc
+
+    def statystyki(self):
+        return {'trafienia': self.trafienia, 'chybienia': self.chybienia, 'rozmiar': len(self.wartosci)}
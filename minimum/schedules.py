@@ -0,0 +1,146 @@
+import time
+from abc import ABC, abstractmethod
+
+
+class CoolingSchedule(ABC):
+    """Bazowy harmonogram wyżarzania: temperatura oraz wspólne warunki stopu.
+
+    Algorytm wywołuje start() przed pętlą, running() jako warunek pętli i update()
+    po każdej iteracji. Warunki stopu (każdy opcjonalny):
+    - min_temp: temperatura spadła do min_temp lub niżej
+    - max_iterations: limit iteracji
+    - time_budget: limit czasu w sekundach
+    - patience: tyle iteracji bez poprawy najlepszego wyniku
+    """
+
+    def __init__(self, initial_temp, min_temp=0, max_iterations=None, time_budget=None, patience=None):
+        self.initial_temp = initial_temp
+        self.min_temp = min_temp
+        self.max_iterations = max_iterations
+        self.time_budget = time_budget
+        self.patience = patience
+        self.start()
+
+    def start(self):
+        self.temp = self.initial_temp
+        self.iteration = 0
+        self.since_improvement = 0
+        self.started = time.perf_counter()
+        return self.temp
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def progress(self):
+        """Postęp w [0, 1] względem limitu iteracji lub czasu (None gdy brak limitu)"""
+        parts = []
+        if self.max_iterations:
+            parts.append(self.iteration / self.max_iterations)
+        if self.time_budget:
+            parts.append(self.elapsed() / self.time_budget)
+        return min(1.0, max(parts)) if parts else None
+
+    def running(self):
+        if self.temp <= self.min_temp:
+            return False
+        if self.max_iterations is not None and self.iteration >= self.max_iterations:
+            return False
+        if self.patience is not None and self.since_improvement >= self.patience:
+            return False
+        if self.time_budget is not None and self.elapsed() >= self.time_budget:
+            return False
+        return True
+
+    def update(self, accepted, improved):
+        """Zapisuje wynik iteracji (czy ruch przyjęto, czy poprawił najlepszy wynik) - zwraca nową temperaturę"""
+        self.iteration += 1
+        self.since_improvement = 0 if improved else self.since_improvement + 1
+        self.temp = self._next_temperature(accepted, improved)
+        return self.temp
+
+    @abstractmethod
+    def _next_temperature(self, accepted, improved):
+        """Temperatura w następnej iteracji"""
+
+
+class GeometricSchedule(CoolingSchedule):
+    """Klasyczne schładzanie T *= alpha"""
+
+    def __init__(self, initial_temp, alpha=0.95, min_temp=0, max_iterations=None, time_budget=None, patience=None):
+        self.alpha = alpha
+        super().__init__(initial_temp, min_temp, max_iterations, time_budget, patience)
+
+    def _next_temperature(self, accepted, improved):
+        return self.temp * self.alpha
+
+
+class TimeBudgetSchedule(CoolingSchedule):
+    """Temperatura zależna od zużytego czasu: od initial_temp do final_temp dokładnie w time_budget sekund"""
+
+    def __init__(self, initial_temp, final_temp, time_budget, min_temp=0, max_iterations=None, patience=None):
+        self.final_temp = final_temp
+        super().__init__(initial_temp, min_temp, max_iterations, time_budget, patience)
+
+    def _next_temperature(self, accepted, improved):
+        fraction = min(1.0, self.elapsed() / self.time_budget)
+        return self.initial_temp * (self.final_temp / self.initial_temp) ** fraction
+
+
+class ReheatingSchedule(GeometricSchedule):
+    """Schładzanie geometryczne z ponownym podgrzaniem po reheat_after iteracjach bez poprawy"""
+
+    def __init__(self, initial_temp, alpha=0.95, reheat_after=100, reheat_factor=10, min_temp=0,
+                 max_iterations=None, time_budget=None, patience=None):
+        self.reheat_after = reheat_after
+        self.reheat_factor = reheat_factor
+        self.reheats = 0
+        super().__init__(initial_temp, alpha, min_temp, max_iterations, time_budget, patience)
+
+    def start(self):
+        self.reheats = 0
+        return super().start()
+
+    def _next_temperature(self, accepted, improved):
+        if self.since_improvement and self.since_improvement % self.reheat_after == 0:
+            self.reheats += 1
+            return min(self.initial_temp, self.temp * self.reheat_factor)
+        return self.temp * self.alpha
+
+
+class AdaptiveSchedule(CoolingSchedule):
+    """Temperatura sterowana odsetkiem przyjętych ruchów.
+
+    Co window iteracji porównuje odsetek przyjętych ruchów z docelowym: gdy jest za niski,
+    podgrzewa (T *= step), gdy za wysoki - schładza (T /= step). Cel maleje liniowo
+    od target_acceptance do final_acceptance wraz z postępem (iteracje lub czas).
+    """
+
+    def __init__(self, initial_temp, target_acceptance=0.5, final_acceptance=0.01, window=100, step=1.25,
+                 min_temp=0, max_iterations=None, time_budget=None, patience=None):
+        self.target_acceptance = target_acceptance
+        self.final_acceptance = final_acceptance
+        self.window = window
+        self.step = step
+        super().__init__(initial_temp, min_temp, max_iterations, time_budget, patience)
+
+    def start(self):
+        self.accepted = 0
+        return super().start()
+
+    def target(self):
+        progress = self.progress()
+        if progress is None:
+            return self.target_acceptance
+        return self.target_acceptance + (self.final_acceptance - self.target_acceptance) * progress
+
+    def _next_temperature(self, accepted, improved):
+        self.accepted += accepted
+        if self.iteration % self.window:
+            return self.temp
+
+        rate = self.accepted / self.window
+        self.accepted = 0
+        if rate < self.target():
+            return self.temp * self.step
+        return self.temp / self.step
+
@@ -0,0 +1,83 @@
+import numpy as np
+
+from main import funkcja_kwadratowa
+from schedules import GeometricSchedule
+
+
+def symulowane_wyzarzanie_wsadowe(f, x_min, x_max, m, T_poczatkowa=1000, alpha=0.95, max_iter=1000, T_min=0,
+                                  historia=False, harmonogram=None, seed=None):
+    """
+    Symulowane wyżarzanie dla m niezależnych łańcuchów naraz, na tablicach NumPy.
+
+    Wszystkie łańcuchy mają wspólną temperaturę i idą krok w krok; propozycje, decyzje
+    o akceptacji i najlepsze wyniki liczone są wektorowo dla całej partii.
+
+    Parametry:
+    - f: funkcja wektorowa - dla tablicy x o kształcie (m,) zwraca tablicę (m,)
+    - x_min, x_max: przedział poszukiwań (liczby albo tablice (m,) - osobno dla każdego łańcucha)
+    - m: liczba łańcuchów
+    - T_poczatkowa, alpha, max_iter, T_min: jak w symulowane_wyzarzanie
+    - historia: czy zapisywać temperatury i minima w kolejnych iteracjach
+    - harmonogram: obiekt z schedules.py; dostaje odsetek przyjętych ruchów i informację,
+      czy którykolwiek łańcuch poprawił swój wynik
+    - seed: ziarno generatora liczb losowych
+
+    Zwraca:
+    - x: tablica (m,) znalezionych punktów minimalnych
+    - f(x): tablica (m,) wartości funkcji w tych punktach
+    - temperatury: lista temperatur (None, gdy historia=False)
+    - minima: tablica (iteracje + 1, m) najlepszych wartości (None, gdy historia=False)
+    """
+    if harmonogram is None:
+        harmonogram = GeometricSchedule(T_poczatkowa, alpha, T_min, max_iter)
+
+    rng = np.random.default_rng(seed)
+    x_min = np.broadcast_to(np.asarray(x_min, dtype=np.float64), (m,))
+    x_max = np.broadcast_to(np.asarray(x_max, dtype=np.float64), (m,))
+
+    # Inicjalizacja
+    T = harmonogram.start()
+    x = rng.uniform(x_min, x_max)
+    fx = np.asarray(f(x), dtype=np.float64)
+    najlepszy_x = x.copy()
+    najlepszy_fx = fx.copy()
+
+    temperatury = [T] if historia else None
+    minima = [najlepszy_fx.copy()] if historia else None
+
+    while harmonogram.running():
+        # Generowanie nowych rozwiązań dla wszystkich łańcuchów
+        x_nowy = np.clip(x + rng.uniform(-1, 1, m) * T, x_min, x_max)
+        fx_nowy = np.asarray(f(x_nowy), dtype=np.float64)
+        delta = fx_nowy - fx
+
+        # Decyzja o akceptacji: lepsze zawsze, gorsze z prawdopodobieństwem exp(-delta/T)
+        przyjete = (delta < 0) | (rng.random(m) < np.exp(-np.maximum(delta, 0) / T))
+        x = np.where(przyjete, x_nowy, x)
+        fx = np.where(przyjete, fx_nowy, fx)
+
+        poprawa = fx < najlepszy_fx
+        najlepszy_x = np.where(poprawa, x, najlepszy_x)
+        najlepszy_fx = np.where(poprawa, fx, najlepszy_fx)
+
+        # Schładzanie
+        T = harmonogram.update(przyjete.mean(), poprawa.any())
+        if historia:
+            temperatury.append(T)
+            minima.append(najlepszy_fx.copy())
+
+    if historia:
+        minima = np.array(minima)
+    return najlepszy_x, najlepszy_fx, temperatury, minima
+
+
+def minimalizuj_kwadratowe(a, b, c, x_min=-10, x_max=10, **kwargs):
+    """Minimalizuje naraz wiele funkcji f(x) = a*x^2 + b*x + c (a, b, c to tablice współczynników)"""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    c = np.asarray(c, dtype=np.float64)
+
+    def f(x):
+        return funkcja_kwadratowa(x, a, b, c)
+
+    return symulowane_wyzarzanie_wsadowe(f, x_min, x_max, len(a), **kwargs)
@@ -0,0 +1,123 @@
+import math
+
+import numpy as np
+
+from pamiec import PamiecEwaluacji
+from schedules import GeometricSchedule
+
+# Liczby losowe losowane są blokami, żeby nie wołać generatora w każdej iteracji
+BLOK_LOSOWAN = 1024
+
+
+class BuforHistorii:
+    """Bufor cykliczny ostatnich `pojemnosc` próbek (iteracja, T, najlepsze f(x))"""
+
+    def __init__(self, pojemnosc):
+        self.pojemnosc = pojemnosc
+        self.iteracje = np.zeros(pojemnosc, dtype=np.int64)
+        self.temperatury = np.zeros(pojemnosc)
+        self.minima = np.zeros(pojemnosc)
+        self.liczba = 0
+
+    def __call__(self, iteracja, T, x, fx):
+        k = self.liczba % self.pojemnosc
+        self.iteracje[k] = iteracja
+        self.temperatury[k] = T
+        self.minima[k] = fx
+        self.liczba += 1
+
+    def dane(self):
+        """Zapisane próbki w kolejności chronologicznej: (iteracje, temperatury, minima)"""
+        n = min(self.liczba, self.pojemnosc)
+        start = self.liczba % self.pojemnosc if self.liczba > self.pojemnosc else 0
+        kolejnosc = (np.arange(n) + start) % self.pojemnosc
+        return self.iteracje[kolejnosc], self.temperatury[kolejnosc], self.minima[kolejnosc]
+
+
+def symulowane_wyzarzanie_nd(f, x_min, x_max, T_poczatkowa=1000, alpha=0.95, max_iter=1000, T_min=0,
+                             skala_kroku=1.0, x0=None, harmonogram=None, callback=None, co_ile=100, seed=None,
+                             tolerancja_pamieci=None, pojemnosc_pamieci=100000):
+    """
+    Symulowane wyżarzanie dla funkcji wielu zmiennych z ograniczeniami w każdym wymiarze.
+
+    Pętla główna nic nie wypisuje i nie zapisuje historii; zamiast tego co `co_ile` iteracji
+    (oraz na końcu) wywoływany jest callback(iteracja, T, najlepszy_x, najlepszy_fx),
+    np. BuforHistorii.
+
+    Parametry:
+    - f: funkcja do minimalizacji, przyjmuje wektor NumPy o długości d
+    - x_min, x_max: granice przedziału w każdym wymiarze (tablice długości d)
+    - T_poczatkowa, alpha, max_iter, T_min: jak w symulowane_wyzarzanie
+    - skala_kroku: mnożnik kroku w każdym wymiarze (liczba lub tablica długości d);
+      krok to uniform(-1, 1) * T * skala_kroku
+    - x0: punkt startowy (domyślnie losowy w granicach)
+    - harmonogram: obiekt z schedules.py (domyślnie T *= alpha)
+    - seed: ziarno generatora liczb losowych
+    - tolerancja_pamieci, pojemnosc_pamieci: włączają PamiecEwaluacji - f nie jest liczona
+      ponownie dla punktów różniących się o mniej niż tolerancja
+
+    Zwraca słownik z kluczami 'x', 'fx' (najlepszy punkt i wartość) oraz 'iteracje';
+    przy włączonej pamięci także 'trafienia' i 'chybienia'.
+    """
+    if harmonogram is None:
+        harmonogram = GeometricSchedule(T_poczatkowa, alpha, T_min, max_iter)
+    pamiec = None
+    if tolerancja_pamieci is not None:
+        f = pamiec = PamiecEwaluacji(f, tolerancja_pamieci, pojemnosc_pamieci)
+
+    rng = np.random.default_rng(seed)
+    x_min = np.asarray(x_min, dtype=np.float64)
+    x_max = np.asarray(x_max, dtype=np.float64)
+    d = x_min.shape[0]
+    skala = np.broadcast_to(np.asarray(skala_kroku, dtype=np.float64), (d,))
+
+    # Inicjalizacja
+    T = harmonogram.start()
+    x = rng.uniform(x_min, x_max) if x0 is None else np.clip(np.asarray(x0, dtype=np.float64), x_min, x_max)
+    fx = float(f(x))
+    najlepszy_x = x
+    najlepszy_fx = fx
+
+    kroki = losowe = None
+    k = BLOK_LOSOWAN
+    iteracja = 0
+
+    while harmonogram.running():
+        if k == BLOK_LOSOWAN:
+            kroki = rng.uniform(-1, 1, (BLOK_LOSOWAN, d)) * skala
+            losowe = rng.random(BLOK_LOSOWAN)
+            k = 0
+
+        # Generowanie nowego rozwiązania (z obcięciem do granic)
+        x_nowy = np.minimum(np.maximum(x + kroki[k] * T, x_min), x_max)
+        fx_nowy = float(f(x_nowy))
+        delta = fx_nowy - fx
+
+        # Decyzja o akceptacji
+        przyjety = poprawa = False
+        if delta < 0:
+            x, fx = x_nowy, fx_nowy
+            przyjety = True
+            if fx < najlepszy_fx:
+                najlepszy_x, najlepszy_fx = x, fx
+                poprawa = True
+        elif losowe[k] < math.exp(-delta / T):
+            x, fx = x_nowy, fx_nowy
+            przyjety = True
+        k += 1
+
+        # Schładzanie
+        T = harmonogram.update(przyjety, poprawa)
+        iteracja += 1
+
+        if callback is not None and iteracja % co_ile == 0:
+            callback(iteracja, T, najlepszy_x, najlepszy_fx)
+
+    if callback is not None and iteracja % co_ile:
+        callback(iteracja, T, najlepszy_x, najlepszy_fx)
+
+    wynik = {'x': najlepszy_x, 'fx': najlepszy_fx, 'iteracje': iteracja}
+    if pamiec is not None:
+        wynik['trafienia'] = pamiec.trafienia
+        wynik['chybienia'] = pamiec.chybienia
+    return wynik